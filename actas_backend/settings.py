@@ -160,6 +160,34 @@ DATABASES = {
 mongoengine.connect(authentication_source=MONGODB_AUTH, db=MONGODB_NAME,
                     username=MONGODB_USER, password=MONGODB_PASS, host=MONGODB_HOST)
 
+# Minutes generation runs outside the web workers (see the generation_worker
+# command), at most this many documents at a time.
+GENERATION_WORKERS = int(os.environ.get('ACTAS_GENERATION_WORKERS', 2))
+# Processes each of those generations uses to render its cases in parallel.
+GENERATION_PROCESSES = int(os.environ.get('ACTAS_GENERATION_PROCESSES', 1))
+# Seconds a job may stay running before a worker takes it as abandoned, by a
+# worker that was stopped or killed, and marks it as failed.
+GENERATION_TIMEOUT = float(os.environ.get('ACTAS_GENERATION_TIMEOUT', 3600))
+# Seconds generated documents, and finished jobs, are kept since last used.
+GENERATION_RETENTION = float(os.environ.get('ACTAS_GENERATION_RETENTION', 7 * 24 * 3600))
+# Largest number of cases /generate?download=true renders within the request,
+# bigger minutes are queued and downloaded from their job.
+DOWNLOAD_MAX_CASES = int(os.environ.get('ACTAS_DOWNLOAD_MAX_CASES', 50))
+# Cases read from Mongo, and sent to the render processes, at a time.
+GENERATION_BATCH_SIZE = int(os.environ.get('ACTAS_GENERATION_BATCH_SIZE', 100))
+# Bytes of rendered case fragments kept between generations, 0 disables it.
+FRAGMENT_CACHE_SIZE = int(os.environ.get('ACTAS_FRAGMENT_CACHE_SIZE', 64 * 1024 * 1024))
+# Bytes of rendered single case previews kept in memory, 0 disables it.
+PREVIEW_CACHE_SIZE = int(os.environ.get('ACTAS_PREVIEW_CACHE_SIZE', 32 * 1024 * 1024))
+# Bytes of a streamed document kept in memory before spilling to a temp file.
+DOCX_SPOOL_SIZE = int(os.environ.get('ACTAS_DOCX_SPOOL_SIZE', 16 * 1024 * 1024))
+# Default and largest number of cases in a page of GET /case.
+CASES_PAGE_SIZE = int(os.environ.get('ACTAS_CASES_PAGE_SIZE', 200))
+# Seconds between reads of new students and subjects for the autofill search.
+AUTOFILL_REFRESH = float(os.environ.get('ACTAS_AUTOFILL_REFRESH', 60))
+# Seconds between full reads, which take in updated and deleted ones as well.
+AUTOFILL_REBUILD = float(os.environ.get('ACTAS_AUTOFILL_REBUILD', 900))
+
 # Password validation
 # https://docs.djangoproject.com/en/2.1/ref/settings/#auth-password-validators
 
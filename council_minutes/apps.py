@@ -3,3 +3,9 @@ from django.apps import AppConfig
 
 class CouncilMinutesConfig(AppConfig):
     name = 'council_minutes'
+
+    def ready(self):
+        # pylint: disable=import-outside-toplevel
+        from .registry import get_case_types, get_case_schemas
+        get_case_types()
+        get_case_schemas()
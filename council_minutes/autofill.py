@@ -0,0 +1,148 @@
+"""
+In-process type-ahead search for the autofill of students and subjects.
+
+Each collection is kept in memory as a sorted list of (key, record) pairs,
+searched by prefix with bisect. Keys are folded to lower case without
+accents, and text is indexed whole and from each of its words on, so both
+'garcia' and 'GARCÍA LÓ' find 'Juan García López'. Documents inserted
+after the load are picked up by reading the ones past the last _id seen, at
+most every settings.AUTOFILL_REFRESH seconds. Updated and deleted ones are
+picked up when the whole collection is read again, every
+settings.AUTOFILL_REBUILD seconds. Both run in a background thread started
+by the search that finds them due; only the first load is waited for.
+"""
+import bisect
+import threading
+import time
+import unicodedata
+from django.conf import settings
+from .models import Person, SubjectAutofill
+
+
+def fold(text):
+    '''Lower case, without accents and with single spaces'''
+    # Legacy documents may hold None or numbers
+    if not isinstance(text, str):
+        text = '' if text is None else str(text)
+    text = unicodedata.normalize('NFKD', text)
+    return ' '.join(''.join(
+        char for char in text if not unicodedata.combining(char)).lower().split())
+
+
+def prefix_keys(text):
+    words = fold(text).split(' ')
+    return {' '.join(words[start:]) for start in range(len(words))} - {''}
+
+
+class PrefixIndex():
+
+    def __init__(self, document, fields, searched):
+        # Every record holds fields, keys are built from the searched ones
+        self.document = document
+        self.fields = fields
+        self.searched = searched
+        # Entries and records are replaced together, searches read both at once
+        self.__index = ([], [])
+        self.__last_id = None
+        self.__refreshed = None
+        self.__rebuilt = None
+        self.__lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.__index[1])
+
+    def refresh(self, rebuild=False):
+        """
+        Adds the documents inserted since the last refresh, or with rebuild
+        (and the first time) reads them all again, updated and deleted ones
+        included
+        """
+        with self.__lock:
+            self.__load(rebuild)
+
+    def __load(self, rebuild):
+        # Runs with the lock held
+        rebuild = rebuild or self.__last_id is None
+        # pylint: disable=no-member
+        documents = self.document.objects
+        if not rebuild:
+            documents = documents(id__gt=self.__last_id)
+        entries, records = ([], []) if rebuild else (self.__index[0], list(self.__index[1]))
+        added = []
+        last_id = None if rebuild else self.__last_id
+        defaults = {name: self.document._fields[name].default for name in self.fields}
+        for son in documents.order_by('id').only(*self.fields).as_pymongo():
+            record = {name: son.get(name, defaults[name]) for name in self.fields}
+            number = len(records)
+            records.append(record)
+            for name in self.searched:
+                added += [(key, number) for key in prefix_keys(record[name])]
+            last_id = son['_id']
+        if rebuild or last_id != self.__last_id:
+            # Searches keep reading the previous index until this one is set
+            self.__index = (sorted(entries + added), records)
+        self.__last_id = last_id
+        self.__refreshed = time.monotonic()
+        if rebuild:
+            self.__rebuilt = self.__refreshed
+
+    def __load_in_background(self, rebuild):
+        try:
+            self.__load(rebuild)
+        finally:
+            self.__lock.release()
+
+    def resolve(self, values):
+        """
+        Exact matches on the first field, the first document of each as the
+        single autofill does, with one $in query. Returns {value: record} and
+        the values not found, in the order given.
+        """
+        key = self.fields[0]
+        values = list(dict.fromkeys(str(value) for value in values))
+        found = {}
+        if values:
+            # pylint: disable=no-member
+            defaults = {name: self.document._fields[name].default for name in self.fields}
+            documents = self.document.objects(**{key + '__in': values})
+            for son in documents.only(*self.fields).as_pymongo():
+                if son.get(key) not in found:
+                    found[son.get(key)] = {name: son.get(name, defaults[name]) for name in self.fields}
+        return found, [value for value in values if value not in found]
+
+    def search(self, text, limit=10):
+        """The first records, in key order, with a key starting with text"""
+        if self.__refreshed is None:
+            # Only the first load is waited for
+            with self.__lock:
+                if self.__refreshed is None:
+                    self.__load(True)
+        else:
+            now = time.monotonic()
+            rebuild = now - self.__rebuilt >= settings.AUTOFILL_REBUILD
+            if (rebuild or now - self.__refreshed >= settings.AUTOFILL_REFRESH) and \
+                    self.__lock.acquire(blocking=False):
+                # Searches keep reading the current index meanwhile
+                threading.Thread(target=self.__load_in_background, args=(rebuild,),
+                                 daemon=True).start()
+        prefix = fold(text)
+        if not prefix:
+            return []
+        entries, records = self.__index
+        found = []
+        seen = set()
+        for position in range(bisect.bisect_left(entries, (prefix,)), len(entries)):
+            key, number = entries[position]
+            if not key.startswith(prefix):
+                break
+            if number not in seen:
+                seen.add(number)
+                found.append(records[number])
+                if len(found) == limit:
+                    break
+        return found
+
+students = PrefixIndex(Person, ('student_dni', 'student_dni_type', 'student_name'),
+                       ('student_dni', 'student_name'))
+subjects = PrefixIndex(SubjectAutofill, ('subject_code', 'subject_name'),
+                       ('subject_code', 'subject_name'))
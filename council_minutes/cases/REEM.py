@@ -10,6 +10,9 @@ class REEM(Request):
 
     full_name = 'Reembolso'
 
+    # cm and pcm read the case where the period was cancelled
+    self_contained = False
+
     credits_refunded = IntField(display='Créditos Disponibles', default=0)
     percentage = FloatField(
         display='Porcentaje de créditos a cancelar', default=0.0)
@@ -5,6 +5,7 @@ from docx.enum.table import WD_ALIGN_VERTICAL
 from mongoengine import StringField, IntField, FloatField, BooleanField, DateField
 from .case_utils import string_to_date, table_general_data
 from .case_utils import table_credits_summary, table_recommend, add_analysis_paragraph
+from .case_utils import TableBuilder
 from ..models import Request
 
 
@@ -229,119 +230,104 @@ class REINPRE(Request):
         bullet.font.bold = True
         bullet.font.size = Pt(8)
 
-        table = docx.add_table(rows=13, cols=3)
+        builder = TableBuilder(docx, rows=13, cols=3)
+        table = builder.table
         table.style = 'Table Grid'
         table.style.font.size = Pt(8)
         table.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        for cell in table.columns[0].cells:
-            cell.width = 400000
-        for cell in table.columns[1].cells:
-            cell.width = 3200000
-        for cell in table.columns[2].cells:
-            cell.width = 1600000
-        table.columns[0].width = 400000
-        table.columns[1].width = 3200000
-        table.columns[2].width = 1600000
-        table.cell(0, 0).merge(table.cell(0, 1)).paragraphs[0].add_run(
+        builder.set_widths([400000, 3200000, 1600000])
+        builder.merge(0, 0, 0, 1).paragraphs[0].add_run(
             self.str_pcm_pre_acadinfo[0])
-        table.cell(0, 2).paragraphs[0].add_run(self.admission_period)
-        table.cell(0, 2).paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
-        table.cell(1, 0).merge(table.cell(1, 1)).paragraphs[0].add_run(
+        builder.cell(0, 2).paragraphs[0].add_run(self.admission_period)
+        builder.cell(0, 2).paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
+        builder.merge(1, 0, 1, 1).paragraphs[0].add_run(
             self.str_pcm_pre_acadinfo[1])
 
         if self.first_reing:
-            table.cell(1, 2).paragraphs[0].add_run('Sí')
+            builder.cell(1, 2).paragraphs[0].add_run('Sí')
         else:
-            table.cell(1, 2).paragraphs[0].add_run('No')
+            builder.cell(1, 2).paragraphs[0].add_run('No')
 
-        table.cell(1, 2).paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
-        table.cell(2, 0).merge(table.cell(2, 2)).paragraphs[0].add_run(
+        builder.cell(1, 2).paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
+        builder.merge(2, 0, 2, 2).paragraphs[0].add_run(
             self.str_pcm_pre_acadinfo[2])
-        table.cell(3, 0).merge(table.cell(3, 1)).paragraphs[0].add_run(
+        builder.merge(3, 0, 3, 1).paragraphs[0].add_run(
             self.str_pcm_pre_acadinfo[3])
-        table.cell(3, 2).paragraphs[0].add_run(self.loss_period)
-        table.cell(3, 2).vertical_alignment = WD_ALIGN_VERTICAL.CENTER
-        table.cell(3, 2).paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
-        table.cell(4, 0).merge(table.cell(4, 1)).paragraphs[0].add_run(
+        builder.cell(3, 2).paragraphs[0].add_run(self.loss_period)
+        builder.cell(3, 2).vertical_alignment = WD_ALIGN_VERTICAL.CENTER
+        builder.cell(3, 2).paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
+        builder.merge(4, 0, 4, 1).paragraphs[0].add_run(
             self.str_pcm_pre_acadinfo[4])
-        table.cell(4, 2).paragraphs[0].add_run(str(self.periods_since))
-        table.cell(4, 2).vertical_alignment = WD_ALIGN_VERTICAL.CENTER
-        table.cell(4, 2).paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
-        table.cell(5, 0).merge(table.cell(5, 2)).paragraphs[0].add_run(
+        builder.cell(4, 2).paragraphs[0].add_run(str(self.periods_since))
+        builder.cell(4, 2).vertical_alignment = WD_ALIGN_VERTICAL.CENTER
+        builder.cell(4, 2).paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
+        builder.merge(5, 0, 5, 2).paragraphs[0].add_run(
             self.str_pcm_pre_acadinfo[5])
-        table.cell(6, 0).merge(table.cell(6, 1)
-                               ).paragraphs[0].add_run(self.str_pcm_pre_acadinfo[6])
-        table.cell(6, 2).paragraphs[0].add_run(str(self.papa))
-        table.cell(6, 2).paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
-        table.cell(7, 0).merge(table.cell(7, 1)).paragraphs[0].add_run(
+        builder.merge(6, 0, 6, 1).paragraphs[0].add_run(self.str_pcm_pre_acadinfo[6])
+        builder.cell(6, 2).paragraphs[0].add_run(str(self.papa))
+        builder.cell(6, 2).paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
+        builder.merge(7, 0, 7, 1).paragraphs[0].add_run(
             self.str_pcm_pre_acadinfo[7])
-        table.cell(7, 0).merge(table.cell(7, 1)
-                               ).vertical_alignment = WD_ALIGN_VERTICAL.CENTER
-        table.cell(7, 2).paragraphs[0].add_run(
+        builder.merge(7, 0, 7, 1).vertical_alignment = WD_ALIGN_VERTICAL.CENTER
+        builder.cell(7, 2).paragraphs[0].add_run(
             # pylint: disable=no-member
             self.get_reason_of_loss_display())
-        table.cell(7, 2).paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
-        table.cell(8, 0).merge(table.cell(8, 2)).paragraphs[0].add_run(
+        builder.cell(7, 2).paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
+        builder.merge(8, 0, 8, 2).paragraphs[0].add_run(
             self.str_pcm_pre_acadinfo[8]).font.bold = True
-        table.cell(9, 0).paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
-        table.cell(9, 0).paragraphs[0].add_run('1').font.bold = True
-        table.cell(10, 0).paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
-        table.cell(10, 0).paragraphs[0].add_run('2').font.bold = True
-        table.cell(11, 0).paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
-        table.cell(11, 0).paragraphs[0].add_run('3').font.bold = True
-        table.cell(12, 0).paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
-        table.cell(12, 0).paragraphs[0].add_run('4').font.bold = True
-        table.cell(9, 1).paragraphs[0].add_run(
+        builder.cell(9, 0).paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
+        builder.cell(9, 0).paragraphs[0].add_run('1').font.bold = True
+        builder.cell(10, 0).paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
+        builder.cell(10, 0).paragraphs[0].add_run('2').font.bold = True
+        builder.cell(11, 0).paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
+        builder.cell(11, 0).paragraphs[0].add_run('3').font.bold = True
+        builder.cell(12, 0).paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
+        builder.cell(12, 0).paragraphs[0].add_run('4').font.bold = True
+        builder.cell(9, 1).paragraphs[0].add_run(
             self.str_pcm_pre_acadinfo[9])
-        table.cell(10, 1).paragraphs[0].add_run(
+        builder.cell(10, 1).paragraphs[0].add_run(
             self.str_pcm_pre_acadinfo[10])
-        table.cell(11, 1).paragraphs[0].add_run(
+        builder.cell(11, 1).paragraphs[0].add_run(
             self.str_pcm_pre_acadinfo[11])
-        table.cell(12, 1).paragraphs[0].add_run(
+        builder.cell(12, 1).paragraphs[0].add_run(
             self.str_pcm_pre_acadinfo[12])
-        table.cell(9, 2).paragraphs[0].add_run(
+        builder.cell(9, 2).paragraphs[0].add_run(
             str(self.credits_minus_remaining))
-        table.cell(9, 2).paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
-        table.cell(10, 2).paragraphs[0].add_run(
+        builder.cell(9, 2).paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
+        builder.cell(10, 2).paragraphs[0].add_run(
             str(self.credits_remaining))
-        table.cell(10, 2).paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
-        table.cell(11, 2).paragraphs[0].add_run(
+        builder.cell(10, 2).paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
+        builder.cell(11, 2).paragraphs[0].add_run(
             str(self.credits_english))
-        table.cell(11, 2).paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
-        table.cell(12, 2).paragraphs[0].add_run(str(self.credits_add))
-        table.cell(12, 2).paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
+        builder.cell(11, 2).paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
+        builder.cell(12, 2).paragraphs[0].add_run(str(self.credits_add))
+        builder.cell(12, 2).paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
 
         # Optional: Grade needed with N credits to keep student condition.
         if self.reason_of_loss == self.RL_ANSWER_CUPO_CREDITOS:
-            table = docx.add_table(rows=5, cols=2)
-            for col in table.columns:
-                for cell in col.cells:
-                    cell.paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
+            builder = TableBuilder(docx, rows=5, cols=2)
+            table = builder.table
+            for cell in builder.column(0) + builder.column(1):
+                cell.paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
             table.style = 'Table Grid'
             table.style.font.size = Pt(8)
             table.alignment = WD_ALIGN_PARAGRAPH.CENTER
-            for cell in table.columns[0].cells:
-                cell.width = 3100000
-            for cell in table.columns[1].cells:
-                cell.width = 2100000
-            table.columns[0].width = 3100000
-            table.columns[1].width = 2100000
-            table.cell(0, 0).merge(table.cell(0, 1)
-                                   ).paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.LEFT
-            table.cell(0, 0).merge(table.cell(0, 1)).paragraphs[0].add_run(
+            builder.set_widths([3100000, 2100000])
+            builder.merge(0, 0, 0, 1).paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.LEFT
+            builder.merge(0, 0, 0, 1).paragraphs[0].add_run(
                 self.str_pcm_pre_acadinfo[13])
-            table.cell(1, 0).paragraphs[0].add_run(
+            builder.cell(1, 0).paragraphs[0].add_run(
                 self.str_pcm_pre_acadinfo[14])
-            table.cell(2, 0).paragraphs[0].add_run(
+            builder.cell(2, 0).paragraphs[0].add_run(
                 self.str_pcm_pre_acadinfo[15])
-            table.cell(3, 0).paragraphs[0].add_run(
+            builder.cell(3, 0).paragraphs[0].add_run(
                 self.str_pcm_pre_acadinfo[16])
-            table.cell(4, 0).paragraphs[0].add_run(
+            builder.cell(4, 0).paragraphs[0].add_run(
                 self.str_pcm_pre_acadinfo[17])
-            table.cell(1, 1).paragraphs[0].add_run(str(self.min_grade_12c))
-            table.cell(2, 1).paragraphs[0].add_run(str(self.min_grade_15c))
-            table.cell(3, 1).paragraphs[0].add_run(str(self.min_grade_18c))
-            table.cell(4, 1).paragraphs[0].add_run(str(self.min_grade_21c))
+            builder.cell(1, 1).paragraphs[0].add_run(str(self.min_grade_12c))
+            builder.cell(2, 1).paragraphs[0].add_run(str(self.min_grade_15c))
+            builder.cell(3, 1).paragraphs[0].add_run(str(self.min_grade_18c))
+            builder.cell(4, 1).paragraphs[0].add_run(str(self.min_grade_21c))
 
     def rein_credits_summary(self, docx):
         paragraph = docx.add_paragraph()
@@ -4,6 +4,7 @@ from mongoengine import StringField, BooleanField, IntField
 from mongoengine import EmbeddedDocumentListField, FloatField
 from ..models import Request, Subject
 from .case_utils import add_analysis_paragraph, table_general_data, string_to_date, table_approvals
+from .case_utils import TableBuilder
 
 
 class TRASPOS(Request):
@@ -295,23 +296,19 @@ class TRASPOS(Request):
         run = paragraph.add_run(self.srt_titles[1])
         run.font.bold = True
         run.font.size = Pt(8)
-        table = docx.add_table(rows=4, cols=2, style='Table Grid')
+        builder = TableBuilder(docx, rows=4, cols=2, style='Table Grid')
+        table = builder.table
         table.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        table.columns[0].width = 4350000
-        table.columns[1].width = 850000
-        for cell in table.columns[0].cells:
-            cell.width = 4350000
-        for cell in table.columns[1].cells:
-            cell.width = 850000
-        table.cell(0, 0).paragraphs[0].add_run(self.str_table[8])
-        table.cell(0, 1).paragraphs[0].add_run(self.admission_period)
-        table.cell(1, 0).paragraphs[0].add_run(self.str_table[9])
-        table.cell(1, 1).paragraphs[0].add_run('Sí' if self.enrroled else 'No')
-        table.cell(2, 0).paragraphs[0].add_run(self.str_table[10])
-        table.cell(2, 1).paragraphs[0].add_run(
+        builder.set_widths([4350000, 850000])
+        builder.cell(0, 0).paragraphs[0].add_run(self.str_table[8])
+        builder.cell(0, 1).paragraphs[0].add_run(self.admission_period)
+        builder.cell(1, 0).paragraphs[0].add_run(self.str_table[9])
+        builder.cell(1, 1).paragraphs[0].add_run('Sí' if self.enrroled else 'No')
+        builder.cell(2, 0).paragraphs[0].add_run(self.str_table[10])
+        builder.cell(2, 1).paragraphs[0].add_run(
             'Sí' if self.prev_plan else 'No')
-        table.cell(3, 0).paragraphs[0].add_run(self.str_table[11])
-        table.cell(3, 1).paragraphs[0].add_run(
+        builder.cell(3, 0).paragraphs[0].add_run(self.str_table[11])
+        builder.cell(3, 1).paragraphs[0].add_run(
             str(self.completion_percentage) + '%')
         paragraph = docx.add_paragraph()
         paragraph.paragraph_format.space_after = Pt(0)
@@ -6,7 +6,7 @@ from mongoengine import StringField, BooleanField, DateField, IntField
 from mongoengine import EmbeddedDocumentListField, FloatField, EmbeddedDocument
 from ..models import Request, Subject
 from .case_utils import add_analysis_paragraph, table_general_data, string_to_date
-from .case_utils import table_credits_summary, table_recommend
+from .case_utils import table_credits_summary, table_recommend, TableBuilder
 
 
 class TRASPRE(Request):
@@ -383,57 +383,48 @@ class TRASPRE(Request):
         run = paragraph.add_run(self.srt_titles[1])
         run.font.bold = True
         run.font.size = Pt(8)
-        table = docx.add_table(rows=4, cols=2, style='Table Grid')
+        builder = TableBuilder(docx, rows=4, cols=2, style='Table Grid')
+        table = builder.table
         table.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        table.columns[0].width = 4350000
-        table.columns[1].width = 850000
-        for cell in table.columns[0].cells:
-            cell.width = 4350000
-        for cell in table.columns[1].cells:
-            cell.width = 850000
+        builder.set_widths([4350000, 850000])
         for i in range(4):
-            table.cell(
+            builder.cell(
                 i, 1).paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
-        table.cell(0, 0).paragraphs[0].add_run(self.str_table[8])
-        table.cell(0, 1).paragraphs[0].add_run(self.admission_period)
-        table.cell(1, 0).paragraphs[0].add_run(self.str_table[9])
-        table.cell(1, 1).paragraphs[0].add_run('Sí' if self.enrroled else 'No')
-        table.cell(2, 0).paragraphs[0].add_run(self.str_table[10])
-        table.cell(2, 1).paragraphs[0].add_run(
+        builder.cell(0, 0).paragraphs[0].add_run(self.str_table[8])
+        builder.cell(0, 1).paragraphs[0].add_run(self.admission_period)
+        builder.cell(1, 0).paragraphs[0].add_run(self.str_table[9])
+        builder.cell(1, 1).paragraphs[0].add_run('Sí' if self.enrroled else 'No')
+        builder.cell(2, 0).paragraphs[0].add_run(self.str_table[10])
+        builder.cell(2, 1).paragraphs[0].add_run(
             'Sí' if self.prev_plan else 'No')
-        table.cell(3, 0).paragraphs[0].add_run(self.str_table[11])
-        table.cell(3, 1).paragraphs[0].add_run(
+        builder.cell(3, 0).paragraphs[0].add_run(self.str_table[11])
+        builder.cell(3, 1).paragraphs[0].add_run(
             str(self.completion_percentage) + '%')
-        table = docx.add_table(rows=2, cols=2, style='Table Grid')
+        builder = TableBuilder(docx, rows=2, cols=2, style='Table Grid')
+        table = builder.table
         table.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        table.columns[0].width = 4350000
-        table.columns[1].width = 850000
-        for cell in table.columns[0].cells:
-            cell.width = 4350000
-            cell.vertical_alignment = WD_ALIGN_VERTICAL.CENTER
-        for cell in table.columns[1].cells:
-            cell.width = 850000
-            cell.vertical_alignment = WD_ALIGN_VERTICAL.CENTER
+        builder.set_widths([4350000, 850000],
+                           vertical_alignment=WD_ALIGN_VERTICAL.CENTER)
         creds_study = True
         if self.completion_percentage < 30.0:
-            table.cell(0, 0).paragraphs[0].add_run(self.str_table[15])
-            table.cell(0, 1).paragraphs[0].add_run(
+            builder.cell(0, 0).paragraphs[0].add_run(self.str_table[15])
+            builder.cell(0, 1).paragraphs[0].add_run(
                 str(self.student_admission_score))
-            table.cell(1, 0).paragraphs[0].add_run(self.str_table[16])
-            table.cell(1, 1).paragraphs[0].add_run(
+            builder.cell(1, 0).paragraphs[0].add_run(self.str_table[16])
+            builder.cell(1, 1).paragraphs[0].add_run(
                 str(self.last_admitted_score))
             creds_study = creds_study and self.student_admission_score > self.last_admitted_score
         else:
-            table.cell(0, 0).paragraphs[0].add_run(self.str_table[17])
-            table.cell(0, 1).paragraphs[0].add_run(str(self.PAPA))
-            table.cell(1, 0).paragraphs[0].add_run(self.str_table[18])
-            table.cell(1, 1).paragraphs[0].add_run(
+            builder.cell(0, 0).paragraphs[0].add_run(self.str_table[17])
+            builder.cell(0, 1).paragraphs[0].add_run(str(self.PAPA))
+            builder.cell(1, 0).paragraphs[0].add_run(self.str_table[18])
+            builder.cell(1, 1).paragraphs[0].add_run(
                 'Sí' if self.PAPA_in_threshold else 'No')
-            table.cell(
+            builder.cell(
                 1, 1).paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
             creds_study = creds_study and self.PAPA_in_threshold
         for i in range(2):
-            table.cell(
+            builder.cell(
                 i, 1).paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
         if not creds_study:
             paragraph = docx.add_paragraph()
@@ -451,37 +442,27 @@ class TRASPRE(Request):
             paragraph.paragraph_format.space_after = Pt(0)
             paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
             run = paragraph.add_run(' ').font.size = Pt(8)
-            table = docx.add_table(rows=4, cols=3, style='Table Grid')
+            builder = TableBuilder(docx, rows=4, cols=3, style='Table Grid')
+            table = builder.table
             table.style.font.size = Pt(8)
             table.alignment = WD_ALIGN_PARAGRAPH.CENTER
-            table.columns[0].width = 200000
-            table.columns[1].width = 4150000
-            table.columns[2].width = 850000
-            for cell in table.columns[0].cells:
-                cell.width = 200000
-                cell.vertical_alignment = WD_ALIGN_VERTICAL.CENTER
-            for cell in table.columns[1].cells:
-                cell.width = 4150000
-                cell.vertical_alignment = WD_ALIGN_VERTICAL.CENTER
-            for cell in table.columns[2].cells:
-                cell.width = 850000
-                cell.vertical_alignment = WD_ALIGN_VERTICAL.CENTER
-            table.cell(0, 0).merge(table.cell(
-                0, 2)).paragraphs[0].add_run(self.str_table[19]).font.bold = True
-            table.cell(1, 0).paragraphs[0].add_run('1')
-            table.cell(1, 1).paragraphs[0].add_run(self.str_table[20])
-            table.cell(1, 2).paragraphs[0].add_run(
+            builder.set_widths([200000, 4150000, 850000],
+                               vertical_alignment=WD_ALIGN_VERTICAL.CENTER)
+            builder.merge(0, 0, 0, 2).paragraphs[0].add_run(self.str_table[19]).font.bold = True
+            builder.cell(1, 0).paragraphs[0].add_run('1')
+            builder.cell(1, 1).paragraphs[0].add_run(self.str_table[20])
+            builder.cell(1, 2).paragraphs[0].add_run(
                 str(self.creds_miunus_remaining))
-            table.cell(2, 0).paragraphs[0].add_run('2')
-            table.cell(2, 1).paragraphs[0].add_run(
+            builder.cell(2, 0).paragraphs[0].add_run('2')
+            builder.cell(2, 1).paragraphs[0].add_run(
                 self.str_table[21].format(Request.regulations['089|2014|CAC'][0]))
-            table.cell(2, 2).paragraphs[0].add_run(str(self.creds_for_transit))
-            table.cell(3, 0).paragraphs[0].add_run('3')
-            table.cell(3, 1).paragraphs[0].add_run(self.str_table[22])
-            table.cell(3, 2).paragraphs[0].add_run(
+            builder.cell(2, 2).paragraphs[0].add_run(str(self.creds_for_transit))
+            builder.cell(3, 0).paragraphs[0].add_run('3')
+            builder.cell(3, 1).paragraphs[0].add_run(self.str_table[22])
+            builder.cell(3, 2).paragraphs[0].add_run(
                 'Sí' if self.creds_for_transit >= self.creds_miunus_remaining else 'No')
             for i in range(1, 4):
-                table.cell(
+                builder.cell(
                     i, 2).paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
             paragraph = docx.add_paragraph()
             paragraph.paragraph_format.space_after = Pt(0)
@@ -535,102 +516,70 @@ class TRASPRE(Request):
             for sbj in self.equivalence:
                 if float(sbj.grade) < 3.0:
                     reproved += 1
-            table = docx.add_table(
-                rows=(len(self.equivalence) + 3 - reproved), cols=9, style='Table Grid')
+            builder = TableBuilder(
+                docx, rows=(len(self.equivalence) + 3 - reproved), cols=9, style='Table Grid')
+            table = builder.table
             table.style.font.size = Pt(8)
             table.alignment = WD_ALIGN_PARAGRAPH.CENTER
-            table.columns[0].width = 550000
-            table.columns[1].width = 550000
-            table.columns[2].width = 900000
-            table.columns[3].width = 500000
-            table.columns[4].width = 900000
-            table.columns[5].width = 250000
-            table.columns[6].width = 900000
-            table.columns[7].width = 250000
-            table.columns[8].width = 400000
-            for cell in table.columns[0].cells:
-                cell.width = 550000
-                cell.vertical_alignment = WD_ALIGN_VERTICAL.CENTER
-            for cell in table.columns[1].cells:
-                cell.width = 550000
-                cell.vertical_alignment = WD_ALIGN_VERTICAL.CENTER
-            for cell in table.columns[2].cells:
-                cell.width = 900000
-                cell.vertical_alignment = WD_ALIGN_VERTICAL.CENTER
-            for cell in table.columns[3].cells:
-                cell.width = 500000
-                cell.vertical_alignment = WD_ALIGN_VERTICAL.CENTER
-            for cell in table.columns[4].cells:
-                cell.width = 900000
-                cell.vertical_alignment = WD_ALIGN_VERTICAL.CENTER
-            for cell in table.columns[5].cells:
-                cell.width = 250000
-                cell.vertical_alignment = WD_ALIGN_VERTICAL.CENTER
-            for cell in table.columns[6].cells:
-                cell.width = 900000
-                cell.vertical_alignment = WD_ALIGN_VERTICAL.CENTER
-            for cell in table.columns[7].cells:
-                cell.width = 250000
-                cell.vertical_alignment = WD_ALIGN_VERTICAL.CENTER
-            for cell in table.columns[8].cells:
-                cell.width = 400000
-                cell.vertical_alignment = WD_ALIGN_VERTICAL.CENTER
-            cellm = table.cell(0, 0).merge(table.cell(0, 2)).paragraphs[0]
+            builder.set_widths([550000, 550000, 900000, 500000, 900000,
+                                250000, 900000, 250000, 400000],
+                               vertical_alignment=WD_ALIGN_VERTICAL.CENTER)
+            cellm = builder.merge(0, 0, 0, 2).paragraphs[0]
             cellm.add_run(
                 self.str_table[26].format('1')).font.bold = True
             cellm.alignment = WD_ALIGN_PARAGRAPH.CENTER
-            cellm = table.cell(0, 3).merge(table.cell(0, 8)).paragraphs[0]
+            cellm = builder.merge(0, 3, 0, 8).paragraphs[0]
             cellm.add_run(
                 self.str_table[26].format('2')).font.bold = True
             cellm.alignment = WD_ALIGN_PARAGRAPH.CENTER
-            table.cell(1, 0).paragraphs[0].add_run(
+            builder.cell(1, 0).paragraphs[0].add_run(
                 self.str_table[27]).font.bold = True
-            table.cell(1, 1).paragraphs[0].add_run(
+            builder.cell(1, 1).paragraphs[0].add_run(
                 self.str_table[28]).font.bold = True
-            table.cell(1, 2).paragraphs[0].add_run(
+            builder.cell(1, 2).paragraphs[0].add_run(
                 self.str_table[29]).font.bold = True
-            table.cell(1, 3).paragraphs[0].add_run(
+            builder.cell(1, 3).paragraphs[0].add_run(
                 self.str_table[28]).font.bold = True
-            table.cell(1, 4).paragraphs[0].add_run(
+            builder.cell(1, 4).paragraphs[0].add_run(
                 self.str_table[29]).font.bold = True
-            table.cell(1, 5).paragraphs[0].add_run(
+            builder.cell(1, 5).paragraphs[0].add_run(
                 self.str_table[30]).font.bold = True
-            table.cell(1, 6).paragraphs[0].add_run(
+            builder.cell(1, 6).paragraphs[0].add_run(
                 self.str_table[31]).font.bold = True
-            table.cell(1, 7).paragraphs[0].add_run(
+            builder.cell(1, 7).paragraphs[0].add_run(
                 self.str_table[32]).font.bold = True
-            table.cell(1, 8).paragraphs[0].add_run(
+            builder.cell(1, 8).paragraphs[0].add_run(
                 self.str_table[33]).font.bold = True
             for i in range(9):
-                table.cell(
+                builder.cell(
                     1, i).paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
             index = 2
             total_creds = 0
             for sbj in self.equivalence:
                 if float(sbj.grade) < 3.0:
                     continue
-                table.cell(index, 0).paragraphs[0].add_run(sbj.period)
-                table.cell(index, 1).paragraphs[0].add_run(sbj.code)
-                table.cell(index, 2).paragraphs[0].add_run(sbj.name)
-                table.cell(index, 3).paragraphs[0].add_run(sbj.code2)
-                table.cell(index, 4).paragraphs[0].add_run(sbj.name2)
-                table.cell(index, 5).paragraphs[0].add_run(sbj.tipology[-1])
-                table.cell(index, 6).paragraphs[0].add_run(sbj.group)
-                table.cell(index, 7).paragraphs[0].add_run(str(sbj.credits))
-                table.cell(index, 8).paragraphs[0].add_run(str(sbj.grade))
+                builder.cell(index, 0).paragraphs[0].add_run(sbj.period)
+                builder.cell(index, 1).paragraphs[0].add_run(sbj.code)
+                builder.cell(index, 2).paragraphs[0].add_run(sbj.name)
+                builder.cell(index, 3).paragraphs[0].add_run(sbj.code2)
+                builder.cell(index, 4).paragraphs[0].add_run(sbj.name2)
+                builder.cell(index, 5).paragraphs[0].add_run(sbj.tipology[-1])
+                builder.cell(index, 6).paragraphs[0].add_run(sbj.group)
+                builder.cell(index, 7).paragraphs[0].add_run(str(sbj.credits))
+                builder.cell(index, 8).paragraphs[0].add_run(str(sbj.grade))
                 total_creds += sbj.credits
                 for i in range(9):
-                    table.cell(
+                    builder.cell(
                         index, i).paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
                 index += 1
-            table.cell(index, 0).merge(table.cell(index, 6)).paragraphs[0].add_run(
+            builder.merge(index, 0, index, 6).paragraphs[0].add_run(
                 self.str_table[47]).font.bold = True
-            table.cell(index, 0).merge(table.cell(index, 6)
-                                       ).paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
-            table.cell(index, 7).merge(table.cell(index, 8)).paragraphs[0].add_run(
+            builder.merge(index, 0, index, 6).paragraphs[0].alignment = \
+                WD_ALIGN_PARAGRAPH.CENTER
+            builder.merge(index, 7, index, 8).paragraphs[0].add_run(
                 str(total_creds)).font.bold = True
-            table.cell(index, 7).merge(table.cell(index, 8)
-                                       ).paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
+            builder.merge(index, 7, index, 8).paragraphs[0].alignment = \
+                WD_ALIGN_PARAGRAPH.CENTER
             if reproved > 0:
                 paragraph = docx.add_paragraph()
                 paragraph.paragraph_format.space_after = Pt(0)
@@ -647,104 +596,72 @@ class TRASPRE(Request):
                 paragraph.paragraph_format.space_after = Pt(0)
                 paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
                 paragraph.add_run(' ').font.size = Pt(8)
-                table = docx.add_table(
-                    rows=(reproved + 3), cols=9, style='Table Grid')
+                builder = TableBuilder(
+                docx, rows=(reproved + 3), cols=9, style='Table Grid')
+                table = builder.table
                 table.style.font.size = Pt(8)
                 table.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                table.columns[0].width = 550000
-                table.columns[1].width = 550000
-                table.columns[2].width = 900000
-                table.columns[3].width = 500000
-                table.columns[4].width = 900000
-                table.columns[5].width = 250000
-                table.columns[6].width = 900000
-                table.columns[7].width = 250000
-                table.columns[8].width = 400000
-                for cell in table.columns[0].cells:
-                    cell.width = 550000
-                    cell.vertical_alignment = WD_ALIGN_VERTICAL.CENTER
-                for cell in table.columns[1].cells:
-                    cell.width = 550000
-                    cell.vertical_alignment = WD_ALIGN_VERTICAL.CENTER
-                for cell in table.columns[2].cells:
-                    cell.width = 900000
-                    cell.vertical_alignment = WD_ALIGN_VERTICAL.CENTER
-                for cell in table.columns[3].cells:
-                    cell.width = 500000
-                    cell.vertical_alignment = WD_ALIGN_VERTICAL.CENTER
-                for cell in table.columns[4].cells:
-                    cell.width = 900000
-                    cell.vertical_alignment = WD_ALIGN_VERTICAL.CENTER
-                for cell in table.columns[5].cells:
-                    cell.width = 250000
-                    cell.vertical_alignment = WD_ALIGN_VERTICAL.CENTER
-                for cell in table.columns[6].cells:
-                    cell.width = 900000
-                    cell.vertical_alignment = WD_ALIGN_VERTICAL.CENTER
-                for cell in table.columns[7].cells:
-                    cell.width = 250000
-                    cell.vertical_alignment = WD_ALIGN_VERTICAL.CENTER
-                for cell in table.columns[8].cells:
-                    cell.width = 400000
-                    cell.vertical_alignment = WD_ALIGN_VERTICAL.CENTER
-                cellm = table.cell(0, 0).merge(table.cell(0, 2)).paragraphs[0]
+                builder.set_widths([550000, 550000, 900000, 500000, 900000,
+                                    250000, 900000, 250000, 400000],
+                                   vertical_alignment=WD_ALIGN_VERTICAL.CENTER)
+                cellm = builder.merge(0, 0, 0, 2).paragraphs[0]
                 cellm.add_run(
                     self.str_table[26].format('1')).font.bold = True
                 cellm.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                cellm = table.cell(0, 3).merge(table.cell(0, 8)).paragraphs[0]
+                cellm = builder.merge(0, 3, 0, 8).paragraphs[0]
                 cellm.add_run(
                     self.str_table[26].format('2')).font.bold = True
                 cellm.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                table.cell(1, 0).paragraphs[0].add_run(
+                builder.cell(1, 0).paragraphs[0].add_run(
                     self.str_table[27]).font.bold = True
-                table.cell(1, 1).paragraphs[0].add_run(
+                builder.cell(1, 1).paragraphs[0].add_run(
                     self.str_table[28]).font.bold = True
-                table.cell(1, 2).paragraphs[0].add_run(
+                builder.cell(1, 2).paragraphs[0].add_run(
                     self.str_table[29]).font.bold = True
-                table.cell(1, 3).paragraphs[0].add_run(
+                builder.cell(1, 3).paragraphs[0].add_run(
                     self.str_table[28]).font.bold = True
-                table.cell(1, 4).paragraphs[0].add_run(
+                builder.cell(1, 4).paragraphs[0].add_run(
                     self.str_table[29]).font.bold = True
-                table.cell(1, 5).paragraphs[0].add_run(
+                builder.cell(1, 5).paragraphs[0].add_run(
                     self.str_table[30]).font.bold = True
-                table.cell(1, 6).paragraphs[0].add_run(
+                builder.cell(1, 6).paragraphs[0].add_run(
                     self.str_table[31]).font.bold = True
-                table.cell(1, 7).paragraphs[0].add_run(
+                builder.cell(1, 7).paragraphs[0].add_run(
                     self.str_table[32]).font.bold = True
-                table.cell(1, 8).paragraphs[0].add_run(
+                builder.cell(1, 8).paragraphs[0].add_run(
                     self.str_table[33]).font.bold = True
                 for i in range(9):
-                    table.cell(
+                    builder.cell(
                         1, i).paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
                 index = 2
                 total_creds = 0
                 for sbj in self.equivalence:
                     if float(sbj.grade) >= 3.0:
                         continue
-                    table.cell(index, 0).paragraphs[0].add_run(sbj.period)
-                    table.cell(index, 1).paragraphs[0].add_run(sbj.code)
-                    table.cell(index, 2).paragraphs[0].add_run(sbj.name)
-                    table.cell(index, 3).paragraphs[0].add_run(sbj.code2)
-                    table.cell(index, 4).paragraphs[0].add_run(sbj.name2)
-                    table.cell(index, 5).paragraphs[0].add_run(
+                    builder.cell(index, 0).paragraphs[0].add_run(sbj.period)
+                    builder.cell(index, 1).paragraphs[0].add_run(sbj.code)
+                    builder.cell(index, 2).paragraphs[0].add_run(sbj.name)
+                    builder.cell(index, 3).paragraphs[0].add_run(sbj.code2)
+                    builder.cell(index, 4).paragraphs[0].add_run(sbj.name2)
+                    builder.cell(index, 5).paragraphs[0].add_run(
                         sbj.tipology[-1])
-                    table.cell(index, 6).paragraphs[0].add_run(sbj.group)
-                    table.cell(index, 7).paragraphs[0].add_run(
+                    builder.cell(index, 6).paragraphs[0].add_run(sbj.group)
+                    builder.cell(index, 7).paragraphs[0].add_run(
                         str(sbj.credits))
-                    table.cell(index, 8).paragraphs[0].add_run(str(sbj.grade))
+                    builder.cell(index, 8).paragraphs[0].add_run(str(sbj.grade))
                     total_creds += sbj.credits
                     for i in range(9):
-                        table.cell(
+                        builder.cell(
                             index, i).paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
                     index += 1
-                table.cell(index, 0).merge(table.cell(index, 6)).paragraphs[0].add_run(
+                builder.merge(index, 0, index, 6).paragraphs[0].add_run(
                     self.str_table[47]).font.bold = True
-                table.cell(index, 0).merge(table.cell(index, 6)
-                                           ).paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
-                table.cell(index, 7).merge(table.cell(index, 8)).paragraphs[0].add_run(
+                builder.merge(index, 0, index, 6).paragraphs[0].alignment = \
+                    WD_ALIGN_PARAGRAPH.CENTER
+                builder.merge(index, 7, index, 8).paragraphs[0].add_run(
                     str(total_creds)).font.bold = True
-                table.cell(index, 7).merge(table.cell(index, 8)
-                                           ).paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
+                builder.merge(index, 7, index, 8).paragraphs[0].alignment = \
+                    WD_ALIGN_PARAGRAPH.CENTER
             paragraph = docx.add_paragraph()
             paragraph.paragraph_format.space_after = Pt(0)
             paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
@@ -775,45 +692,28 @@ class TRASPRE(Request):
             for sbj in self.remaining:
                 if sbj.tipology == self.PendingSubject.TIP_DISCIPLINAR:
                     disciplinare += 1
-            table = docx.add_table(
-                rows=(len(self.remaining) - disciplinare + 4), cols=5, style='Table Grid')
+            builder = TableBuilder(
+                docx, rows=(len(self.remaining) - disciplinare + 4), cols=5, style='Table Grid')
+            table = builder.table
             table.style.font.size = Pt(8)
             table.alignment = WD_ALIGN_PARAGRAPH.CENTER
-            table.columns[0].width = 1000000
-            table.columns[1].width = 600000
-            table.columns[2].width = 1700000
-            table.columns[3].width = 700000
-            table.columns[4].width = 1200000
-            for cell in table.columns[0].cells:
-                cell.width = 1000000
-                cell.vertical_alignment = WD_ALIGN_VERTICAL.CENTER
-            for cell in table.columns[1].cells:
-                cell.width = 600000
-                cell.vertical_alignment = WD_ALIGN_VERTICAL.CENTER
-            for cell in table.columns[2].cells:
-                cell.width = 1700000
-                cell.vertical_alignment = WD_ALIGN_VERTICAL.CENTER
-            for cell in table.columns[3].cells:
-                cell.width = 700000
-                cell.vertical_alignment = WD_ALIGN_VERTICAL.CENTER
-            for cell in table.columns[4].cells:
-                cell.width = 1200000
-                cell.vertical_alignment = WD_ALIGN_VERTICAL.CENTER
-            table.cell(0, 0).merge(table.cell(0, 4)).paragraphs[0].add_run(
+            builder.set_widths([1000000, 600000, 1700000, 700000, 1200000],
+                               vertical_alignment=WD_ALIGN_VERTICAL.CENTER)
+            builder.merge(0, 0, 0, 4).paragraphs[0].add_run(
                 self.str_table[36]).font.bold = True
-            table.cell(1, 0).merge(table.cell(1, 4)).paragraphs[0].add_run(
+            builder.merge(1, 0, 1, 4).paragraphs[0].add_run(
                 self.str_table[37]).font.bold = True
-            table.cell(0, 0).merge(table.cell(
-                0, 4)).paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
-            table.cell(1, 0).merge(table.cell(
-                1, 4)).paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
-            table.cell(2, 0).paragraphs[0].add_run(self.str_table[31])
-            table.cell(2, 1).paragraphs[0].add_run(self.str_table[28])
-            table.cell(2, 2).paragraphs[0].add_run(self.str_table[29])
-            table.cell(2, 3).paragraphs[0].add_run(self.str_table[38])
-            table.cell(2, 4).paragraphs[0].add_run(self.str_table[39])
+            builder.merge(0, 0, 0, 4).paragraphs[0].alignment = \
+                WD_ALIGN_PARAGRAPH.CENTER
+            builder.merge(1, 0, 1, 4).paragraphs[0].alignment = \
+                WD_ALIGN_PARAGRAPH.CENTER
+            builder.cell(2, 0).paragraphs[0].add_run(self.str_table[31])
+            builder.cell(2, 1).paragraphs[0].add_run(self.str_table[28])
+            builder.cell(2, 2).paragraphs[0].add_run(self.str_table[29])
+            builder.cell(2, 3).paragraphs[0].add_run(self.str_table[38])
+            builder.cell(2, 4).paragraphs[0].add_run(self.str_table[39])
             for i in range(5):
-                table.cell(
+                builder.cell(
                     2, i).paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
             index = 3
             total_creds = 0
@@ -831,65 +731,55 @@ class TRASPRE(Request):
                     proceced_creds[sbj.group] = sbj.credits
             ordered_list = []
             for i in proceced_remaining:
-                fc = table.cell(index, 0).merge(table.cell(
-                    index + len(proceced_remaining[i]) - 1, 0)).paragraphs[0]
+                fc = builder.merge(
+                    index, 0, index + len(proceced_remaining[i]) - 1, 0).paragraphs[0]
                 fc.alignment = WD_ALIGN_PARAGRAPH.CENTER
                 fc.add_run(i)
-                sc = table.cell(index, 4).merge(table.cell(
-                    index + len(proceced_remaining[i]) - 1, 4)).paragraphs[0]
+                sc = builder.merge(
+                    index, 4, index + len(proceced_remaining[i]) - 1, 4).paragraphs[0]
                 sc.alignment = WD_ALIGN_PARAGRAPH.CENTER
                 sc.add_run(str(proceced_creds[i]))
                 index += len(proceced_remaining[i])
                 ordered_list += proceced_remaining[i]
             index = 3
             for sbj in ordered_list:
-                table.cell(index, 1).paragraphs[0].add_run(sbj.code)
-                table.cell(index, 2).paragraphs[0].add_run(sbj.name)
-                table.cell(index, 3).paragraphs[0].add_run(
+                builder.cell(index, 1).paragraphs[0].add_run(sbj.code)
+                builder.cell(index, 2).paragraphs[0].add_run(sbj.name)
+                builder.cell(index, 3).paragraphs[0].add_run(
                     str(sbj.credits))
                 for i in range(1, 4):
-                    table.cell(
+                    builder.cell(
                         index, i).paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
                 index += 1
-            table.cell(index, 0).merge(
-                table.cell(index, 2)).paragraphs[0].add_run(self.str_table[40]).font.bold = True
-            table.cell(index, 0).merge(
-                table.cell(index, 2)).paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
-            table.cell(index, 3).merge(
-                table.cell(index, 4)).paragraphs[0].add_run(str(total_creds))
-            table.cell(index, 3).merge(
-                table.cell(index, 4)).paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
+            builder.merge(index, 0, index, 2).paragraphs[0].add_run(
+                self.str_table[40]).font.bold = True
+            builder.merge(index, 0, index, 2).paragraphs[0].alignment = \
+                WD_ALIGN_PARAGRAPH.CENTER
+            builder.merge(index, 3, index, 4).paragraphs[0].add_run(str(total_creds))
+            builder.merge(index, 3, index, 4).paragraphs[0].alignment = \
+                WD_ALIGN_PARAGRAPH.CENTER
             fundam = 0
             for agr in self.optative_remaining:
                 if agr.tipology == self.Optative.TIP_DISCIPLINAR:
                     continue
                 fundam += 1
-            table = docx.add_table(
-                rows=(fundam + 3), cols=3, style='Table Grid')
+            builder = TableBuilder(
+                docx, rows=(fundam + 3), cols=3, style='Table Grid')
+            table = builder.table
             table.style.font.size = Pt(8)
             table.alignment = WD_ALIGN_PARAGRAPH.CENTER
-            table.columns[0].width = 2000000
-            table.columns[1].width = 2000000
-            table.columns[2].width = 1200000
-            for cell in table.columns[0].cells:
-                cell.width = 2000000
-                cell.vertical_alignment = WD_ALIGN_VERTICAL.CENTER
-            for cell in table.columns[1].cells:
-                cell.width = 2000000
-                cell.vertical_alignment = WD_ALIGN_VERTICAL.CENTER
-            for cell in table.columns[2].cells:
-                cell.width = 1200000
-                cell.vertical_alignment = WD_ALIGN_VERTICAL.CENTER
-            cell = table.cell(0, 0).merge(table.cell(0, 2)).paragraphs[0]
+            builder.set_widths([2000000, 2000000, 1200000],
+                               vertical_alignment=WD_ALIGN_VERTICAL.CENTER)
+            cell = builder.merge(0, 0, 0, 2).paragraphs[0]
             cell.alignment = WD_ALIGN_PARAGRAPH.CENTER
             cell.add_run(self.str_table[45]).font.bold = True
-            cell = table.cell(1, 0).paragraphs[0]
+            cell = builder.cell(1, 0).paragraphs[0]
             cell.alignment = WD_ALIGN_PARAGRAPH.CENTER
             cell.add_run(self.str_table[41]).font.bold = True
-            cell = table.cell(1, 1).paragraphs[0]
+            cell = builder.cell(1, 1).paragraphs[0]
             cell.alignment = WD_ALIGN_PARAGRAPH.CENTER
             cell.add_run(self.str_table[39]).font.bold = True
-            cell = table.cell(1, 2).paragraphs[0]
+            cell = builder.cell(1, 2).paragraphs[0]
             cell.alignment = WD_ALIGN_PARAGRAPH.CENTER
             cell.add_run(self.str_table[41]).font.bold = True
             index = 2
@@ -897,22 +787,21 @@ class TRASPRE(Request):
             for agr in self.optative_remaining:
                 if agr.tipology == self.Optative.TIP_DISCIPLINAR:
                     continue
-                cell = table.cell(index, 0).paragraphs[0]
+                cell = builder.cell(index, 0).paragraphs[0]
                 cell.alignment = WD_ALIGN_PARAGRAPH.CENTER
                 cell.add_run(agr.group)
-                cell = table.cell(index, 1).paragraphs[0]
+                cell = builder.cell(index, 1).paragraphs[0]
                 cell.alignment = WD_ALIGN_PARAGRAPH.CENTER
                 cell.add_run(str(agr.required_creds))
-                cell = table.cell(index, 2).paragraphs[0]
+                cell = builder.cell(index, 2).paragraphs[0]
                 cell.alignment = WD_ALIGN_PARAGRAPH.CENTER
                 cell.add_run(str(agr.pending_creds))
                 total += agr.pending_creds
                 index += 1
-            cell = table.cell(index, 0).merge(
-                table.cell(index, 1)).paragraphs[0]
+            cell = builder.merge(index, 0, index, 1).paragraphs[0]
             cell.alignment = WD_ALIGN_PARAGRAPH.CENTER
             cell.add_run(self.str_table[40]).font.bold = True
-            cell = table.cell(index, 2).paragraphs[0]
+            cell = builder.cell(index, 2).paragraphs[0]
             cell.alignment = WD_ALIGN_PARAGRAPH.CENTER
             cell.add_run(str(total))
             paragraph = docx.add_paragraph()
@@ -923,45 +812,28 @@ class TRASPRE(Request):
             for sbj in self.remaining:
                 if sbj.tipology == self.PendingSubject.TIP_FUNDAMENTACION:
                     fundam += 1
-            table = docx.add_table(
-                rows=(len(self.remaining) - fundam + 4), cols=5, style='Table Grid')
+            builder = TableBuilder(
+                docx, rows=(len(self.remaining) - fundam + 4), cols=5, style='Table Grid')
+            table = builder.table
             table.style.font.size = Pt(8)
             table.alignment = WD_ALIGN_PARAGRAPH.CENTER
-            table.columns[0].width = 1000000
-            table.columns[1].width = 600000
-            table.columns[2].width = 1700000
-            table.columns[3].width = 700000
-            table.columns[4].width = 1200000
-            for cell in table.columns[0].cells:
-                cell.width = 1000000
-                cell.vertical_alignment = WD_ALIGN_VERTICAL.CENTER
-            for cell in table.columns[1].cells:
-                cell.width = 600000
-                cell.vertical_alignment = WD_ALIGN_VERTICAL.CENTER
-            for cell in table.columns[2].cells:
-                cell.width = 1700000
-                cell.vertical_alignment = WD_ALIGN_VERTICAL.CENTER
-            for cell in table.columns[3].cells:
-                cell.width = 700000
-                cell.vertical_alignment = WD_ALIGN_VERTICAL.CENTER
-            for cell in table.columns[4].cells:
-                cell.width = 1200000
-                cell.vertical_alignment = WD_ALIGN_VERTICAL.CENTER
-            table.cell(0, 0).merge(table.cell(0, 4)).paragraphs[0].add_run(
+            builder.set_widths([1000000, 600000, 1700000, 700000, 1200000],
+                               vertical_alignment=WD_ALIGN_VERTICAL.CENTER)
+            builder.merge(0, 0, 0, 4).paragraphs[0].add_run(
                 self.str_table[43]).font.bold = True
-            table.cell(1, 0).merge(table.cell(1, 4)).paragraphs[0].add_run(
+            builder.merge(1, 0, 1, 4).paragraphs[0].add_run(
                 self.str_table[37]).font.bold = True
-            table.cell(0, 0).merge(table.cell(
-                0, 4)).paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
-            table.cell(1, 0).merge(table.cell(
-                1, 4)).paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
-            table.cell(2, 0).paragraphs[0].add_run(self.str_table[31])
-            table.cell(2, 1).paragraphs[0].add_run(self.str_table[28])
-            table.cell(2, 2).paragraphs[0].add_run(self.str_table[29])
-            table.cell(2, 3).paragraphs[0].add_run(self.str_table[38])
-            table.cell(2, 4).paragraphs[0].add_run(self.str_table[39])
+            builder.merge(0, 0, 0, 4).paragraphs[0].alignment = \
+                WD_ALIGN_PARAGRAPH.CENTER
+            builder.merge(1, 0, 1, 4).paragraphs[0].alignment = \
+                WD_ALIGN_PARAGRAPH.CENTER
+            builder.cell(2, 0).paragraphs[0].add_run(self.str_table[31])
+            builder.cell(2, 1).paragraphs[0].add_run(self.str_table[28])
+            builder.cell(2, 2).paragraphs[0].add_run(self.str_table[29])
+            builder.cell(2, 3).paragraphs[0].add_run(self.str_table[38])
+            builder.cell(2, 4).paragraphs[0].add_run(self.str_table[39])
             for i in range(5):
-                table.cell(
+                builder.cell(
                     2, i).paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
             index = 3
             total_creds = 0
@@ -979,65 +851,55 @@ class TRASPRE(Request):
                     proceced_creds[sbj.group] = sbj.credits
             ordered_list = []
             for i in proceced_remaining:
-                fc = table.cell(index, 0).merge(table.cell(
-                    index + len(proceced_remaining[i]) - 1, 0)).paragraphs[0]
+                fc = builder.merge(
+                    index, 0, index + len(proceced_remaining[i]) - 1, 0).paragraphs[0]
                 fc.alignment = WD_ALIGN_PARAGRAPH.CENTER
                 fc.add_run(i)
-                sc = table.cell(index, 4).merge(table.cell(
-                    index + len(proceced_remaining[i]) - 1, 4)).paragraphs[0]
+                sc = builder.merge(
+                    index, 4, index + len(proceced_remaining[i]) - 1, 4).paragraphs[0]
                 sc.alignment = WD_ALIGN_PARAGRAPH.CENTER
                 sc.add_run(str(proceced_creds[i]))
                 index += len(proceced_remaining[i])
                 ordered_list += proceced_remaining[i]
             index = 3
             for sbj in ordered_list:
-                table.cell(index, 1).paragraphs[0].add_run(sbj.code)
-                table.cell(index, 2).paragraphs[0].add_run(sbj.name)
-                table.cell(index, 3).paragraphs[0].add_run(
+                builder.cell(index, 1).paragraphs[0].add_run(sbj.code)
+                builder.cell(index, 2).paragraphs[0].add_run(sbj.name)
+                builder.cell(index, 3).paragraphs[0].add_run(
                     str(sbj.credits))
                 for i in range(1, 4):
-                    table.cell(
+                    builder.cell(
                         index, i).paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
                 index += 1
-            table.cell(index, 0).merge(
-                table.cell(index, 2)).paragraphs[0].add_run(self.str_table[40]).font.bold = True
-            table.cell(index, 0).merge(
-                table.cell(index, 2)).paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
-            table.cell(index, 3).merge(
-                table.cell(index, 4)).paragraphs[0].add_run(str(total_creds))
-            table.cell(index, 3).merge(
-                table.cell(index, 4)).paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
+            builder.merge(index, 0, index, 2).paragraphs[0].add_run(
+                self.str_table[40]).font.bold = True
+            builder.merge(index, 0, index, 2).paragraphs[0].alignment = \
+                WD_ALIGN_PARAGRAPH.CENTER
+            builder.merge(index, 3, index, 4).paragraphs[0].add_run(str(total_creds))
+            builder.merge(index, 3, index, 4).paragraphs[0].alignment = \
+                WD_ALIGN_PARAGRAPH.CENTER
             disc = 0
             for agr in self.optative_remaining:
                 if agr.tipology == self.Optative.TIP_FUNDAMENTACION:
                     continue
                 disc += 1
-            table = docx.add_table(
-                rows=(disc + 3), cols=3, style='Table Grid')
+            builder = TableBuilder(
+                docx, rows=(disc + 3), cols=3, style='Table Grid')
+            table = builder.table
             table.style.font.size = Pt(8)
             table.alignment = WD_ALIGN_PARAGRAPH.CENTER
-            table.columns[0].width = 2000000
-            table.columns[1].width = 2000000
-            table.columns[2].width = 1200000
-            for cell in table.columns[0].cells:
-                cell.width = 2000000
-                cell.vertical_alignment = WD_ALIGN_VERTICAL.CENTER
-            for cell in table.columns[1].cells:
-                cell.width = 2000000
-                cell.vertical_alignment = WD_ALIGN_VERTICAL.CENTER
-            for cell in table.columns[2].cells:
-                cell.width = 1200000
-                cell.vertical_alignment = WD_ALIGN_VERTICAL.CENTER
-            cell = table.cell(0, 0).merge(table.cell(0, 2)).paragraphs[0]
+            builder.set_widths([2000000, 2000000, 1200000],
+                               vertical_alignment=WD_ALIGN_VERTICAL.CENTER)
+            cell = builder.merge(0, 0, 0, 2).paragraphs[0]
             cell.alignment = WD_ALIGN_PARAGRAPH.CENTER
             cell.add_run(self.str_table[45]).font.bold = True
-            cell = table.cell(1, 0).paragraphs[0]
+            cell = builder.cell(1, 0).paragraphs[0]
             cell.alignment = WD_ALIGN_PARAGRAPH.CENTER
             cell.add_run(self.str_table[41]).font.bold = True
-            cell = table.cell(1, 1).paragraphs[0]
+            cell = builder.cell(1, 1).paragraphs[0]
             cell.alignment = WD_ALIGN_PARAGRAPH.CENTER
             cell.add_run(self.str_table[39]).font.bold = True
-            cell = table.cell(1, 2).paragraphs[0]
+            cell = builder.cell(1, 2).paragraphs[0]
             cell.alignment = WD_ALIGN_PARAGRAPH.CENTER
             cell.add_run(self.str_table[41]).font.bold = True
             index = 2
@@ -1045,44 +907,38 @@ class TRASPRE(Request):
             for agr in self.optative_remaining:
                 if agr.tipology == self.Optative.TIP_FUNDAMENTACION:
                     continue
-                cell = table.cell(index, 0).paragraphs[0]
+                cell = builder.cell(index, 0).paragraphs[0]
                 cell.alignment = WD_ALIGN_PARAGRAPH.CENTER
                 cell.add_run(agr.group)
-                cell = table.cell(index, 1).paragraphs[0]
+                cell = builder.cell(index, 1).paragraphs[0]
                 cell.alignment = WD_ALIGN_PARAGRAPH.CENTER
                 cell.add_run(str(agr.required_creds))
-                cell = table.cell(index, 2).paragraphs[0]
+                cell = builder.cell(index, 2).paragraphs[0]
                 cell.alignment = WD_ALIGN_PARAGRAPH.CENTER
                 cell.add_run(str(agr.pending_creds))
                 total += agr.pending_creds
                 index += 1
-            cell = table.cell(index, 0).merge(
-                table.cell(index, 1)).paragraphs[0]
+            cell = builder.merge(index, 0, index, 1).paragraphs[0]
             cell.alignment = WD_ALIGN_PARAGRAPH.CENTER
             cell.add_run(self.str_table[40]).font.bold = True
-            cell = table.cell(index, 2).paragraphs[0]
+            cell = builder.cell(index, 2).paragraphs[0]
             cell.alignment = WD_ALIGN_PARAGRAPH.CENTER
             cell.add_run(str(total))
             paragraph = docx.add_paragraph()
             paragraph.paragraph_format.space_after = Pt(0)
             paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
             paragraph.add_run(' ').font.size = Pt(8)
-            table = docx.add_table(rows=1, cols=2, style='Table Grid')
+            builder = TableBuilder(docx, rows=1, cols=2, style='Table Grid')
+            table = builder.table
             table.style.font.size = Pt(8)
             table.alignment = WD_ALIGN_PARAGRAPH.CENTER
-            table.columns[0].width = 4350000
-            table.columns[1].width = 850000
-            for cell in table.columns[0].cells:
-                cell.width = 4350000
-                cell.vertical_alignment = WD_ALIGN_VERTICAL.CENTER
-            for cell in table.columns[1].cells:
-                cell.width = 850000
-                cell.vertical_alignment = WD_ALIGN_VERTICAL.CENTER
-            table.cell(0, 0).paragraphs[0].add_run(
+            builder.set_widths([4350000, 850000],
+                               vertical_alignment=WD_ALIGN_VERTICAL.CENTER)
+            builder.cell(0, 0).paragraphs[0].add_run(
                 self.str_table[44]).font.bold = True
-            table.cell(0, 1).paragraphs[0].add_run(
+            builder.cell(0, 1).paragraphs[0].add_run(
                 str(self.free_choice_pending))
-            table.cell(
+            builder.cell(
                 0, 1).paragraphs[0].alignment = WD_ALIGN_VERTICAL.CENTER
             paragraph = docx.add_paragraph()
             paragraph.paragraph_format.space_after = Pt(0)
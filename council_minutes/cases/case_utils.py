@@ -14,6 +14,10 @@ def add_hyperlink(paragraph_, text, url):
     :return: The hyperlink object
     """
 
+    # The lightweight documents in council_minutes.renderers keep links themselves
+    if hasattr(paragraph_, 'add_hyperlink'):
+        return paragraph_.add_hyperlink(text, url)
+
     # This gets access to the document.xml.rels file and gets a new relation id value
     part = paragraph_.part
     r_id = part.relate_to(
@@ -134,6 +138,67 @@ def header(request, docx_):
     para.paragraph_format.space_after = Pt(0)
 
 
+class TableBuilder():
+    '''Adds a table to a document and fills it through a cached cell grid.
+
+    python-docx rebuilds the whole cell grid on every table.cell() call and
+    every table.columns[i].cells access, which makes filling big tables
+    quadratic. The builder reads the grid once and keeps it up to date when
+    merging, so every cell access is constant time.
+
+        Params:
+            docx_ (docx_): The document to which the table will be added
+            rows (int), cols (int): The table dimensions
+            style (string): The table style, if any
+    '''
+
+    def __init__(self, docx_, rows, cols, style=None):
+        self.table = docx_.add_table(rows=rows, cols=cols, style=style)
+        # pylint: disable=protected-access
+        cells = self.table._cells
+        self.grid = [cells[row * cols:(row + 1) * cols] for row in range(rows)]
+
+    def cell(self, row, col):
+        return self.grid[row][col]
+
+    def column(self, col):
+        return [row[col] for row in self.grid]
+
+    def merge(self, row, col, row_2, col_2):
+        '''Merges the rectangle between both cells and returns the merged cell'''
+        merged = self.grid[row][col].merge(self.grid[row_2][col_2])
+        for i in range(min(row, row_2), max(row, row_2) + 1):
+            for j in range(min(col, col_2), max(col, col_2) + 1):
+                self.grid[i][j] = merged
+        return merged
+
+    def set_widths(self, widths, vertical_alignment=None, alignment=None):
+        '''Sets the width of every column and of all its cells, and optionally
+        the vertical and paragraph alignment of every cell, in one pass'''
+        for col, width in enumerate(widths):
+            self.table.columns[col].width = width
+        for row in self.grid:
+            for cell, width in zip(row, widths):
+                cell.width = width
+                if vertical_alignment is not None:
+                    cell.vertical_alignment = vertical_alignment
+                if alignment is not None:
+                    cell.paragraphs[0].alignment = alignment
+
+    def add_run(self, row, col, text, bold=False):
+        run = self.grid[row][col].paragraphs[0].add_run(text)
+        if bold:
+            run.font.bold = True
+        return run
+
+    def align(self, row, col, alignment=None, vertical_alignment=None):
+        cell = self.grid[row][col]
+        if alignment is not None:
+            cell.paragraphs[0].alignment = alignment
+        if vertical_alignment is not None:
+            cell.vertical_alignment = vertical_alignment
+
+
 def table_general_data(general_data, case, docx_):
     '''
     Add a generated table with general data
@@ -148,23 +213,13 @@ def table_general_data(general_data, case, docx_):
         2.  case (string):  DOBLE TITULACIÓN or REINGRESO or TRASLADO
         3.  docx_ (docx_):  The document to which the table will be added
     '''
-    table = docx_.add_table(rows=len(general_data) + 1,
-                            cols=3, style='Table Grid')
+    builder = TableBuilder(docx_, len(general_data) + 1, 3, style='Table Grid')
+    table = builder.table
     table.style.font.size = Pt(8)
     table.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    table.columns[0].width = 400000
-    table.columns[1].width = 2400000
-    table.columns[2].width = 2400000
-    for cell in table.columns[0].cells:
-        cell.width = 400000
-        cell.vertical_alignment = WD_ALIGN_VERTICAL.CENTER
-    for cell in table.columns[1].cells:
-        cell.width = 2400000
-        cell.vertical_alignment = WD_ALIGN_VERTICAL.CENTER
-    for cell in table.columns[2].cells:
-        cell.width = 2400000
-        cell.vertical_alignment = WD_ALIGN_VERTICAL.CENTER
-    cellp = table.cell(0, 0).merge(table.cell(0, 2)).paragraphs[0]
+    builder.set_widths([400000, 2400000, 2400000],
+                       vertical_alignment=WD_ALIGN_VERTICAL.CENTER)
+    cellp = builder.merge(0, 0, 0, 2).paragraphs[0]
     cellp.alignment = WD_ALIGN_PARAGRAPH.CENTER
     cellp.add_run(case + '\n').font.bold = True
     if case == "DOBLE TITULACIÓN":
@@ -179,12 +234,11 @@ def table_general_data(general_data, case, docx_):
         cellp.add_run(
             'Normativa Asociada: Articulo 39 del Acuerdo 008 de 2008 '
             'del CSU y Acuerdo 089 de 2014 del C.A.')
-    # pylint: disable=consider-using-enumerate
-    for i in range(len(general_data)):
-        table.cell(i+1, 0).paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
-        table.cell(i+1, 0).paragraphs[0].add_run(str(i+1)).font.bold = True
-        for j in range(0, len(general_data[i])):
-            table.cell(i+1, j+1).paragraphs[0].add_run(general_data[i][j])
+    for i, data in enumerate(general_data):
+        builder.align(i+1, 0, WD_ALIGN_PARAGRAPH.CENTER)
+        builder.add_run(i+1, 0, str(i+1), bold=True)
+        for j, value in enumerate(data):
+            builder.add_run(i+1, j+1, value)
 
 
 def table_subjects(docx_, data):
@@ -202,42 +256,18 @@ def table_subjects(docx_, data):
             IndexError: All lists must have same size
 
     '''
-    table = docx_.add_table(rows=len(data)+1, cols=5)
-    for column in table.columns:
-        for cell in column.cells:
-            cell.paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
-            cell.vertical_alignment = WD_ALIGN_VERTICAL.CENTER
-    table.style = 'Table Grid'
+    builder = TableBuilder(docx_, len(data)+1, 5, style='Table Grid')
+    table = builder.table
     table.style.font.size = Pt(9)
     table.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    table.columns[0].width = 700000
-    table.columns[1].width = 2250000
-    table.columns[2].width = 600000
-    table.columns[3].width = 1050000
-    table.columns[4].width = 600000
-    for cell in table.columns[0].cells:
-        cell.width = 700000
-    for cell in table.columns[1].cells:
-        cell.width = 2250000
-    for cell in table.columns[2].cells:
-        cell.width = 600000
-    for cell in table.columns[3].cells:
-        cell.width = 1050000
-    for cell in table.columns[4].cells:
-        cell.width = 600000
-    table.cell(0, 0).paragraphs[0].add_run('Código').font.bold = True
-    table.cell(0, 1).paragraphs[0].add_run('Asignatura').font.bold = True
-    table.cell(0, 2).paragraphs[0].add_run('Grupo').font.bold = True
-    table.cell(0, 3).paragraphs[0].add_run('Tipología').font.bold = True
-    table.cell(0, 4).paragraphs[0].add_run('Créditos').font.bold = True
-    index = 1
-    for _ in data:
-        table.cell(index, 0).paragraphs[0].add_run(data[index-1][0])
-        table.cell(index, 1).paragraphs[0].add_run(data[index-1][1])
-        table.cell(index, 2).paragraphs[0].add_run(data[index-1][2])
-        table.cell(index, 3).paragraphs[0].add_run(data[index-1][3])
-        table.cell(index, 4).paragraphs[0].add_run(data[index-1][4])
-        index = index + 1
+    builder.set_widths([700000, 2250000, 600000, 1050000, 600000],
+                       vertical_alignment=WD_ALIGN_VERTICAL.CENTER,
+                       alignment=WD_ALIGN_PARAGRAPH.CENTER)
+    for j, title in enumerate(('Código', 'Asignatura', 'Grupo', 'Tipología', 'Créditos')):
+        builder.add_run(0, j, title, bold=True)
+    for index, subject in enumerate(data, 1):
+        for j in range(5):
+            builder.add_run(index, j, subject[j])
 
 
 def table_english(docx_, subjects, details):
@@ -264,89 +294,52 @@ def table_english(docx_, subjects, details):
             IndexError: All lists must have same size
 
     '''
-    table = docx_.add_table(rows=len(subjects)+5, cols=7)
-    table.style = 'Table Grid'
+    builder = TableBuilder(docx_, len(subjects)+5, 7, style='Table Grid')
+    table = builder.table
     table.style.font.size = Pt(8)
     table.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    table.columns[0].width = 600000
-    table.columns[1].width = 1800000
-    table.columns[2].width = 300000
-    table.columns[3].width = 300000
-    table.columns[4].width = 400000
-    table.columns[5].width = 1400000
-    table.columns[6].width = 400000
-    for cell in table.columns[0].cells:
-        cell.width = 600000
-    for cell in table.columns[1].cells:
-        cell.width = 1800000
-    for cell in table.columns[2].cells:
-        cell.width = 300000
-    for cell in table.columns[3].cells:
-        cell.width = 300000
-    for cell in table.columns[4].cells:
-        cell.width = 400000
-    for cell in table.columns[5].cells:
-        cell.width = 1400000
-    for cell in table.columns[6].cells:
-        cell.width = 400000
-    cell = table.cell(0, 0).merge(table.cell(0, 6)).paragraphs[0]
+    builder.set_widths([600000, 1800000, 300000, 300000, 400000, 1400000, 400000])
+    cell = builder.merge(0, 0, 0, 6).paragraphs[0]
     cell.alignment = WD_ALIGN_PARAGRAPH.JUSTIFY
     cell.add_run(details[2] + '\t\tDNI. ' + details[3]).font.bold = True
-    cell = table.cell(1, 0).merge(table.cell(1, 4)).paragraphs[0]
+    cell = builder.merge(1, 0, 1, 4).paragraphs[0]
     str_prog = 'Asignaturas a homologar en el plan de estudios {} ({})'
     cell.add_run(str_prog.format(details[4], details[5])).font.bold = True
 
-    cellp = table.cell(1, 5).merge(table.cell(2, 5)).paragraphs[0]
-    cellp.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    table.cell(1, 5).merge(table.cell(2, 5)).paragraphs[0].add_run(
-        'Examen de inglés presentado').font.bold = True
-    table.cell(1, 5).merge(table.cell(2, 5)
-                           ).vertical_alignment = WD_ALIGN_VERTICAL.CENTER
+    merged = builder.merge(1, 5, 2, 5)
+    merged.paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
+    merged.paragraphs[0].add_run('Examen de inglés presentado').font.bold = True
+    merged.vertical_alignment = WD_ALIGN_VERTICAL.CENTER
 
-    cellp = table.cell(1, 6).merge(table.cell(2, 6)).paragraphs[0]
-    cellp.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    table.cell(1, 6).merge(table.cell(2, 6)).paragraphs[0].add_run(
-        'Nota').font.bold = True
-    table.cell(1, 6).merge(table.cell(2, 6)
-                           ).vertical_alignment = WD_ALIGN_VERTICAL.CENTER
-
-    cell = table.cell(3, 5).merge(table.cell(
-        len(subjects)+2, 5)).paragraphs[0]
-    cell.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    cell.add_run(details[0])
-    table.cell(3, 5).merge(table.cell(len(
-        subjects)+2, 5)).vertical_alignment = WD_ALIGN_VERTICAL.CENTER
-
-    cell = table.cell(3, 6).merge(table.cell(
-        len(subjects)+2, 6)).paragraphs[0]
-    cell.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    cell.add_run(details[1])
-    table.cell(3, 6).merge(table.cell(len(
-        subjects)+2, 6)).vertical_alignment = WD_ALIGN_VERTICAL.CENTER
-
-    table.cell(2, 0).paragraphs[0].add_run('Código').font.bold = True
-    table.cell(2, 1).paragraphs[0].add_run('Asignatura').font.bold = True
-    table.cell(2, 2).paragraphs[0].add_run('C').font.bold = True
-    table.cell(2, 3).paragraphs[0].add_run('T').font.bold = True
-    table.cell(2, 4).paragraphs[0].add_run('Nota').font.bold = True
+    merged = builder.merge(1, 6, 2, 6)
+    merged.paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
+    merged.paragraphs[0].add_run('Nota').font.bold = True
+    merged.vertical_alignment = WD_ALIGN_VERTICAL.CENTER
+
+    merged = builder.merge(3, 5, len(subjects)+2, 5)
+    merged.paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
+    merged.paragraphs[0].add_run(details[0])
+    merged.vertical_alignment = WD_ALIGN_VERTICAL.CENTER
+
+    merged = builder.merge(3, 6, len(subjects)+2, 6)
+    merged.paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
+    merged.paragraphs[0].add_run(details[1])
+    merged.vertical_alignment = WD_ALIGN_VERTICAL.CENTER
+
+    for j, title in enumerate(('Código', 'Asignatura', 'C', 'T', 'Nota')):
+        builder.add_run(2, j, title, bold=True)
     index = 0
     credits_sum = 0
     for subject in subjects:
         credits_sum = credits_sum + int(3)
-        table.cell(index+3, 0).paragraphs[0].add_run(subject[0])
-        table.cell(index+3, 1).paragraphs[0].add_run(subject[1])
-        table.cell(index+3, 2).paragraphs[0].add_run(subject[2])
-        table.cell(index+3, 3).paragraphs[0].add_run(subject[3])
-        table.cell(index+3, 4).paragraphs[0].add_run(subject[4])
+        for j in range(5):
+            builder.add_run(index+3, j, subject[j])
         index = index + 1
-    cellp = table.cell(index+3, 0).merge(table.cell(index+3, 3)).paragraphs[0]
-    cellp.add_run('Créditos homologados P')
-    cellp = table.cell(index+3, 4).merge(table.cell(index+3, 6)).paragraphs[0]
-    cellp.add_run(str(credits_sum))
-    cellp = table.cell(index+4, 0).merge(table.cell(index+4, 3)).paragraphs[0]
-    cellp.add_run('Total créditos que se homologan')
-    cellp = table.cell(index+4, 4).merge(table.cell(index+4, 6)).paragraphs[0]
-    cellp.add_run(str(credits_sum))
+    builder.merge(index+3, 0, index+3, 3).paragraphs[0].add_run('Créditos homologados P')
+    builder.merge(index+3, 4, index+3, 6).paragraphs[0].add_run(str(credits_sum))
+    builder.merge(index+4, 0, index+4, 3).paragraphs[0].add_run(
+        'Total créditos que se homologan')
+    builder.merge(index+4, 4, index+4, 6).paragraphs[0].add_run(str(credits_sum))
 
 
 def table_approvals(docx_, subjects, details):
@@ -389,110 +382,57 @@ def table_approvals(docx_, subjects, details):
             periods.append(asign[0])
     asign_number = len(subjects)
     tipology_number = len(tipology)
-    table = docx_.add_table(
-        rows=(4+asign_number+tipology_number), cols=8, style='Table Grid')
+    builder = TableBuilder(
+        docx_, 4+asign_number+tipology_number, 8, style='Table Grid')
+    table = builder.table
     table.style.font.size = Pt(8)
     table.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    table.columns[0].width = 500000
-    table.columns[1].width = 550000
-    table.columns[2].width = 1350000
-    table.columns[3].width = 300000
-    table.columns[4].width = 300000
-    table.columns[5].width = 400000
-    table.columns[6].width = 1400000
-    table.columns[7].width = 400000
-    for cell in table.columns[0].cells:
-        cell.width = 500000
-    for cell in table.columns[1].cells:
-        cell.width = 550000
-    for cell in table.columns[2].cells:
-        cell.width = 1350000
-    for cell in table.columns[3].cells:
-        cell.width = 300000
-    for cell in table.columns[4].cells:
-        cell.width = 300000
-    for cell in table.columns[5].cells:
-        cell.width = 400000
-    for cell in table.columns[6].cells:
-        cell.width = 1400000
-    for cell in table.columns[7].cells:
-        cell.width = 400000
-    cellp = table.cell(0, 0).merge(table.cell(0, 7)).paragraphs[0]
+    builder.set_widths(
+        [500000, 550000, 1350000, 300000, 300000, 400000, 1400000, 400000])
+    cellp = builder.merge(0, 0, 0, 7).paragraphs[0]
     cellp.alignment = WD_ALIGN_PARAGRAPH.CENTER
     cellp.add_run('{}\t\t\tDNI.{}'.format(
         details[0], details[1])).font.bold = True
-    cellp = table.cell(1, 0).merge(table.cell(1, 5)).paragraphs[0]
+    merged = builder.merge(1, 0, 1, 5)
+    cellp = merged.paragraphs[0]
     cellp.alignment = WD_ALIGN_PARAGRAPH.CENTER
     cellp.add_run('Asignaturas a homologar en el plan de estudios de {} ({})'.format(
         get_academic_program(details[2]), details[2])).font.bold = True
-    table.cell(1, 0).merge(table.cell(1, 5)
-                           ).vertical_alignment = WD_ALIGN_VERTICAL.CENTER
-    cellp = table.cell(1, 6).merge(table.cell(1, 7)).paragraphs[0]
+    merged.vertical_alignment = WD_ALIGN_VERTICAL.CENTER
+    cellp = builder.merge(1, 6, 1, 7).paragraphs[0]
     cellp.alignment = WD_ALIGN_PARAGRAPH.CENTER
     cellp.add_run('Asignaturas cursadas en {}'.format(
         details[3])).font.bold = True
     for i in range(2, asign_number + 3):
         for j in range(8):
-            table.cell(
-                i, j).paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
-    table.cell(2, 0).paragraphs[0].add_run('Periodo').font.bold = True
-    table.cell(2, 0).vertical_alignment = WD_ALIGN_VERTICAL.CENTER
-    table.cell(2, 1).paragraphs[0].add_run('Código').font.bold = True
-    table.cell(2, 1).vertical_alignment = WD_ALIGN_VERTICAL.CENTER
-    table.cell(2, 2).paragraphs[0].add_run('Asignatura').font.bold = True
-    table.cell(2, 2).vertical_alignment = WD_ALIGN_VERTICAL.CENTER
-    table.cell(2, 3).paragraphs[0].add_run('C').font.bold = True
-    table.cell(2, 3).vertical_alignment = WD_ALIGN_VERTICAL.CENTER
-    table.cell(2, 4).paragraphs[0].add_run('T').font.bold = True
-    table.cell(2, 4).vertical_alignment = WD_ALIGN_VERTICAL.CENTER
-    table.cell(2, 5).paragraphs[0].add_run('Nota').font.bold = True
-    table.cell(2, 5).vertical_alignment = WD_ALIGN_VERTICAL.CENTER
-    table.cell(2, 6).paragraphs[0].add_run('Asignatura').font.bold = True
-    table.cell(2, 6).vertical_alignment = WD_ALIGN_VERTICAL.CENTER
-    table.cell(2, 7).paragraphs[0].add_run('Nota').font.bold = True
-    table.cell(2, 7).vertical_alignment = WD_ALIGN_VERTICAL.CENTER
+            builder.align(i, j, WD_ALIGN_PARAGRAPH.CENTER)
+    titles = ('Periodo', 'Código', 'Asignatura', 'C', 'T', 'Nota', 'Asignatura', 'Nota')
+    for j, title in enumerate(titles):
+        builder.add_run(2, j, title, bold=True)
+        builder.align(2, j, vertical_alignment=WD_ALIGN_VERTICAL.CENTER)
     count = 3
     for subject in subjects:
-        table.cell(count, 0).paragraphs[0].add_run(subject[0])
-        table.cell(count, 0).vertical_alignment = WD_ALIGN_VERTICAL.CENTER
-        table.cell(count, 1).paragraphs[0].add_run(subject[1])
-        table.cell(count, 1).vertical_alignment = WD_ALIGN_VERTICAL.CENTER
-        table.cell(count, 2).paragraphs[0].add_run(
-            subject[2])
-        table.cell(count, 2).vertical_alignment = WD_ALIGN_VERTICAL.CENTER
-        table.cell(count, 3).paragraphs[0].add_run(str(subject[3]))
-        table.cell(count, 3).vertical_alignment = WD_ALIGN_VERTICAL.CENTER
-        table.cell(count, 4).paragraphs[0].add_run(subject[4])
-        table.cell(count, 4).vertical_alignment = WD_ALIGN_VERTICAL.CENTER
-        table.cell(count, 5).paragraphs[0].add_run(subject[5])
-        table.cell(count, 5).vertical_alignment = WD_ALIGN_VERTICAL.CENTER
-        table.cell(count, 6).paragraphs[0].add_run(
-            subject[6])
-        table.cell(count, 6).vertical_alignment = WD_ALIGN_VERTICAL.CENTER
-        table.cell(count, 7).paragraphs[0].add_run(subject[7])
-        table.cell(count, 7).vertical_alignment = WD_ALIGN_VERTICAL.CENTER
+        for j in range(8):
+            builder.add_run(count, j, str(subject[3]) if j == 3 else subject[j])
+            builder.align(count, j, vertical_alignment=WD_ALIGN_VERTICAL.CENTER)
         count += 1
     total_homologated = 0
     for tip in tipology:
         text = 'Créditos homologados ' + str(tip)
-        table.cell(count, 0).merge(table.cell(
-            count, 5)).paragraphs[0].add_run(text)
-        table.cell(count, 0).merge(table.cell(count, 5)
-                                   ).paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
-        table.cell(count, 6).merge(table.cell(count, 7)
-                                   ).paragraphs[0].add_run(str(tipology[tip]))
-        table.cell(count, 6).merge(table.cell(count, 7)
-                                   ).paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
+        cellp = builder.merge(count, 0, count, 5).paragraphs[0]
+        cellp.add_run(text)
+        cellp.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        cellp = builder.merge(count, 6, count, 7).paragraphs[0]
+        cellp.add_run(str(tipology[tip]))
+        cellp.alignment = WD_ALIGN_PARAGRAPH.CENTER
         total_homologated += int(tipology[tip])
         count += 1
-    table.cell(count, 0).merge(table.cell(count, 5)).paragraphs[0].add_run(
-        'Total créditos que se homologan')
-    table.cell(count, 0).merge(table.cell(count, 5)
-                               ).paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
-    table.cell(count, 6).merge(table.cell(count, 7)
-                               ).paragraphs[0].add_run(str(total_homologated))
-    table.cell(count, 6).merge(table.cell(count, 7)
-                               ).paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
+    cellp = builder.merge(count, 0, count, 5).paragraphs[0]
+    cellp.add_run('Total créditos que se homologan')
+    cellp.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    cellp = builder.merge(count, 6, count, 7).paragraphs[0]
+    cellp.add_run(str(total_homologated))
+    cellp.alignment = WD_ALIGN_PARAGRAPH.CENTER
 
 
 def table_repprovals(docx_, subjects, details):
@@ -522,63 +462,39 @@ def table_repprovals(docx_, subjects, details):
 
     '''
     asign_number = len(subjects)
-    table = docx_.add_table(
-        rows=(3+asign_number), cols=6, style='Table Grid')
+    builder = TableBuilder(docx_, 3+asign_number, 6, style='Table Grid')
+    table = builder.table
     table.style.font.size = Pt(8)
     table.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    table.columns[0].width = 500000
-    table.columns[1].width = 850000
-    table.columns[2].width = 1400000
-    table.columns[3].width = 1850000
-    table.columns[4].width = 300000
-    table.columns[5].width = 300000
-    for cell in table.columns[0].cells:
-        cell.width = 500000
-        cell.vertical_alignment = WD_ALIGN_VERTICAL.CENTER
-    for cell in table.columns[1].cells:
-        cell.width = 850000
-        cell.vertical_alignment = WD_ALIGN_VERTICAL.CENTER
-    for cell in table.columns[2].cells:
-        cell.width = 1400000
-        cell.vertical_alignment = WD_ALIGN_VERTICAL.CENTER
-    for cell in table.columns[3].cells:
-        cell.width = 1850000
-        cell.vertical_alignment = WD_ALIGN_VERTICAL.CENTER
-    for cell in table.columns[4].cells:
-        cell.width = 300000
-        cell.vertical_alignment = WD_ALIGN_VERTICAL.CENTER
-    for cell in table.columns[5].cells:
-        cell.width = 300000
-        cell.vertical_alignment = WD_ALIGN_VERTICAL.CENTER
-    cellp = table.cell(0, 0).merge(table.cell(0, 5)).paragraphs[0]
+    builder.set_widths([500000, 850000, 1400000, 1850000, 300000, 300000],
+                       vertical_alignment=WD_ALIGN_VERTICAL.CENTER)
+    cellp = builder.merge(0, 0, 0, 5).paragraphs[0]
     cellp.alignment = WD_ALIGN_PARAGRAPH.CENTER
     cellp.add_run('{}\t\t\tDNI.{}'.format(
         details[0], details[1])).font.bold = True
-    cellp = table.cell(1, 0).merge(table.cell(1, 5)).paragraphs[0]
+    cellp = builder.merge(1, 0, 1, 5).paragraphs[0]
     cellp.alignment = WD_ALIGN_PARAGRAPH.CENTER
     cellp.add_run('Asignaturas que no se homologan en el plan de estudios {} ({})'.format(
         get_academic_program(details[2]), details[2])).font.bold = True
     for i in range(2, asign_number + 3):
         for j in range(6):
-            table.cell(
-                i, j).paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
-    table.cell(2, 0).paragraphs[0].add_run('Periodo').font.bold = True
-    table.cell(2, 1).paragraphs[0].add_run(
-        'Asignatura Universidad Nacional de Colombia - ({})'.format(details[2])).font.bold = True
-    table.cell(2, 2).paragraphs[0].add_run(
-        'Asignatura cursada en {}'.format(details[3])).font.bold = True
-    table.cell(2, 3).paragraphs[0].add_run('Justificación').font.bold = True
-    table.cell(2, 4).paragraphs[0].add_run('C').font.bold = True
-    table.cell(2, 5).paragraphs[0].add_run('Nota').font.bold = True
+            builder.align(i, j, WD_ALIGN_PARAGRAPH.CENTER)
+    builder.add_run(2, 0, 'Periodo', bold=True)
+    builder.add_run(
+        2, 1, 'Asignatura Universidad Nacional de Colombia - ({})'.format(details[2]),
+        bold=True)
+    builder.add_run(2, 2, 'Asignatura cursada en {}'.format(details[3]), bold=True)
+    builder.add_run(2, 3, 'Justificación', bold=True)
+    builder.add_run(2, 4, 'C', bold=True)
+    builder.add_run(2, 5, 'Nota', bold=True)
     count = 3
     for subject in subjects:
-        table.cell(count, 0).paragraphs[0].add_run(subject[0])
-        table.cell(count, 1).paragraphs[0].add_run(subject[1])
-        table.cell(count, 2).paragraphs[0].add_run(
-            subject[2])
-        table.cell(count, 3).paragraphs[0].add_run(str(subject[3]))
-        table.cell(count, 4).paragraphs[0].add_run(str(subject[4]))
-        table.cell(count, 5).paragraphs[0].add_run(subject[5])
+        builder.add_run(count, 0, subject[0])
+        builder.add_run(count, 1, subject[1])
+        builder.add_run(count, 2, subject[2])
+        builder.add_run(count, 3, str(subject[3]))
+        builder.add_run(count, 4, str(subject[4]))
+        builder.add_run(count, 5, subject[5])
         count += 1
 
 
@@ -608,76 +524,52 @@ def table_credits_summary(docx_, credits_, case):
         IndexError: All lists must have same size
     '''
 
-    table = docx_.add_table(rows=5, cols=7, style='Table Grid')
+    builder = TableBuilder(docx_, 5, 7, style='Table Grid')
+    table = builder.table
     table.style.font.size = Pt(8)
     table.alignment = WD_ALIGN_PARAGRAPH.CENTER
-
-    for cell in table.columns[0].cells:
-        cell.width = 1610000
-    for cell in table.columns[1].cells:
-        cell.width = 690000
-    for cell in table.columns[2].cells:
-        cell.width = 610000
-    for cell in table.columns[3].cells:
-        cell.width = 690000
-    for cell in table.columns[4].cells:
-        cell.width = 610000
-    for cell in table.columns[5].cells:
-        cell.width = 675000
-    for cell in table.columns[6].cells:
-        cell.width = 375000
-    table.columns[0].width = 1610000
-    table.columns[1].width = 690000
-    table.columns[2].width = 610000
-    table.columns[3].width = 690000
-    table.columns[4].width = 610000
-    table.columns[5].width = 675000
-    table.columns[6].width = 375000
-    for column in table.columns:
-        for cell in column.cells:
-            cell.vertical_alignment = WD_ALIGN_VERTICAL.CENTER
-    cellp = table.cell(0, 0).merge(table.cell(1, 0)).paragraphs[0]
+    builder.set_widths([1610000, 690000, 610000, 690000, 610000, 675000, 375000],
+                       vertical_alignment=WD_ALIGN_VERTICAL.CENTER)
+    cellp = builder.merge(0, 0, 1, 0).paragraphs[0]
     cellp.add_run('Créditos')
     cellp.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    table.cell(2, 0).paragraphs[0].add_run('Exigidos*')
+    builder.add_run(2, 0, 'Exigidos*')
     if case == "DOBLE TITULACIÓN":
-        table.cell(3, 0).paragraphs[0].add_run('Convalidados/equivalentes**')
+        builder.add_run(3, 0, 'Convalidados/equivalentes**')
     elif case == 'REINGRESO':
-        table.cell(3, 0).paragraphs[0].add_run(
-            'Aprobados del plan de estudios')
+        builder.add_run(3, 0, 'Aprobados del plan de estudios')
     else:
-        table.cell(3, 0).paragraphs[0].add_run('Convalidados/equivalentes')
+        builder.add_run(3, 0, 'Convalidados/equivalentes')
 
-    table.cell(4, 0).paragraphs[0].add_run('Pendientes')
-    cellp = table.cell(0, 1).merge(table.cell(0, 2)).paragraphs[0]
+    builder.add_run(4, 0, 'Pendientes')
+    cellp = builder.merge(0, 1, 0, 2).paragraphs[0]
     cellp.add_run('Fundamentación (B)')
     cellp.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    table.cell(1, 1).paragraphs[0].add_run('Obligatorios')
-    table.cell(1, 1).paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
-    table.cell(1, 2).paragraphs[0].add_run('Optativos')
-    table.cell(1, 2).paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
-    cellp = table.cell(0, 3).merge(table.cell(0, 4)).paragraphs[0]
+    builder.add_run(1, 1, 'Obligatorios')
+    builder.align(1, 1, WD_ALIGN_PARAGRAPH.CENTER)
+    builder.add_run(1, 2, 'Optativos')
+    builder.align(1, 2, WD_ALIGN_PARAGRAPH.CENTER)
+    cellp = builder.merge(0, 3, 0, 4).paragraphs[0]
     cellp.add_run('Disciplinar (C)')
     cellp.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    table.cell(1, 3).paragraphs[0].add_run('Obligatorios')
-    table.cell(1, 3).paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
-    table.cell(1, 4).paragraphs[0].add_run('Optativos')
-    table.cell(1, 4).paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
-    cellp = table.cell(0, 5).merge(table.cell(1, 5)).paragraphs[0]
+    builder.add_run(1, 3, 'Obligatorios')
+    builder.align(1, 3, WD_ALIGN_PARAGRAPH.CENTER)
+    builder.add_run(1, 4, 'Optativos')
+    builder.align(1, 4, WD_ALIGN_PARAGRAPH.CENTER)
+    cellp = builder.merge(0, 5, 1, 5).paragraphs[0]
     cellp.add_run('Libre Elección (L)')
     cellp.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    cellp = table.cell(0, 6).merge(table.cell(1, 6)).paragraphs[0]
+    cellp = builder.merge(0, 6, 1, 6).paragraphs[0]
     cellp.add_run('Total')
     cellp.alignment = WD_ALIGN_PARAGRAPH.CENTER
     for i in range(0, 3):
         suma = 0
         for j in range(0, 5):
-            table.cell(2+i, j+1).paragraphs[0].add_run(str(credits_[i][j]))
-            table.cell(
-                2+i, j+1).paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
+            builder.add_run(2+i, j+1, str(credits_[i][j]))
+            builder.align(2+i, j+1, WD_ALIGN_PARAGRAPH.CENTER)
             suma += credits_[i][j]
-        table.cell(2+i, 6).paragraphs[0].add_run(str(suma))
-        table.cell(2+i, 6).paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
+        builder.add_run(2+i, 6, str(suma))
+        builder.align(2+i, 6, WD_ALIGN_PARAGRAPH.CENTER)
 
 
 def table_recommend(docx_, details):
@@ -692,46 +584,30 @@ def table_recommend(docx_, details):
         [3]: Comite's acta year
         [4]: Recommend(boolean)
     '''
-    table = docx_.add_table(rows=1, cols=5)
-    table.style = 'Table Grid'
+    builder = TableBuilder(docx_, 1, 5, style='Table Grid')
+    table = builder.table
     table.style.font.size = Pt(8)
     table.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    for cell in table.columns[0].cells:
-        cell.width = 3000000
-    for cell in table.columns[1].cells:
-        cell.width = 800000
-    for cell in table.columns[2].cells:
-        cell.width = 300000
-    for cell in table.columns[3].cells:
-        cell.width = 800000
-    for cell in table.columns[4].cells:
-        cell.width = 300000
-    table.columns[0].width = 3000000
-    table.columns[1].width = 800000
-    table.columns[2].width = 300000
-    table.columns[3].width = 800000
-    table.columns[4].width = 300000
-
-    table.cell(0, 0).paragraphs[0].add_run(
-        'El ' + details[0] + ' en sesión del día ')
-    table.cell(0, 0).paragraphs[0].add_run(
-        str(details[1])[0:2] + num_to_month(int(str(details[1])[4:5])) + str(details[1])[6:10])
-    table.cell(0, 0).paragraphs[0].add_run(
-        '. Acta ' + str(details[2]) + ' de ' + str(details[3]) + '.')
-    table.cell(0, 1).paragraphs[0].add_run('Recomienda')
-    table.cell(0, 1).vertical_alignment = WD_ALIGN_VERTICAL.CENTER
-    table.cell(0, 1).paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
-    table.cell(0, 3).paragraphs[0].add_run('No Recomienda')
-    table.cell(0, 3).vertical_alignment = WD_ALIGN_VERTICAL.CENTER
-    table.cell(0, 3).paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
+    builder.set_widths([3000000, 800000, 300000, 800000, 300000])
+
+    builder.add_run(0, 0, 'El ' + details[0] + ' en sesión del día ')
+    builder.add_run(
+        0, 0, str(details[1])[0:2] + num_to_month(int(str(details[1])[4:5])) +
+        str(details[1])[6:10])
+    builder.add_run(
+        0, 0, '. Acta ' + str(details[2]) + ' de ' + str(details[3]) + '.')
+    builder.add_run(0, 1, 'Recomienda')
+    builder.align(0, 1, WD_ALIGN_PARAGRAPH.CENTER, WD_ALIGN_VERTICAL.CENTER)
+    builder.add_run(0, 3, 'No Recomienda')
+    builder.align(0, 3, WD_ALIGN_PARAGRAPH.CENTER, WD_ALIGN_VERTICAL.CENTER)
     if details[4]:
-        table.cell(0, 2).paragraphs[0].add_run('X')
-        table.cell(0, 2).paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
+        builder.add_run(0, 2, 'X')
+        builder.align(0, 2, WD_ALIGN_PARAGRAPH.CENTER)
     else:
-        table.cell(0, 4).paragraphs[0].add_run('X')
-        table.cell(0, 4).paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
-    table.cell(0, 2).vertical_alignment = WD_ALIGN_VERTICAL.CENTER
-    table.cell(0, 4).vertical_alignment = WD_ALIGN_VERTICAL.CENTER
+        builder.add_run(0, 4, 'X')
+        builder.align(0, 4, WD_ALIGN_PARAGRAPH.CENTER)
+    builder.align(0, 2, vertical_alignment=WD_ALIGN_VERTICAL.CENTER)
+    builder.align(0, 4, vertical_alignment=WD_ALIGN_VERTICAL.CENTER)
 
 
 def table_change_typology(docx_, subjects):
@@ -748,36 +624,14 @@ def table_change_typology(docx_, subjects):
         Raises:
             IndexError: All lists must have same size
     '''
-    table = docx_.add_table(rows=len(subjects)+1, cols=5)
+    builder = TableBuilder(docx_, len(subjects)+1, 5, style='Table Grid')
+    table = builder.table
     table.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    table.style = 'Table Grid'
     table.style.font.size = Pt(9)
-    table.columns[0].width = 700000
-    table.columns[1].width = 2000000
-    table.columns[2].width = 600000
-    table.columns[3].width = 1050000
-    table.columns[4].width = 1050000
-    for cell in table.columns[0].cells:
-        cell.width = 700000
-    for cell in table.columns[1].cells:
-        cell.width = 2000000
-    for cell in table.columns[2].cells:
-        cell.width = 600000
-    for cell in table.columns[3].cells:
-        cell.width = 1050000
-    for cell in table.columns[4].cells:
-        cell.width = 1050000
-    table.cell(0, 0).paragraphs[0].add_run('Código').font.bold = True
-    table.cell(0, 1).paragraphs[0].add_run('Asignatura').font.bold = True
-    table.cell(0, 2).paragraphs[0].add_run('Nota').font.bold = True
-    table.cell(0, 3).paragraphs[0].add_run(
-        'Componente Registrado').font.bold = True
-    table.cell(0, 4).paragraphs[0].add_run('Nuevo Componente').font.bold = True
-    index = 0
-    for subject in subjects:
-        table.cell(index+1, 0).paragraphs[0].add_run(subject[0])
-        table.cell(index+1, 1).paragraphs[0].add_run(subject[1])
-        table.cell(index+1, 2).paragraphs[0].add_run(subject[2])
-        table.cell(index+1, 3).paragraphs[0].add_run(subject[3])
-        table.cell(index+1, 4).paragraphs[0].add_run(subject[4])
-        index = index + 1
+    builder.set_widths([700000, 2000000, 600000, 1050000, 1050000])
+    titles = ('Código', 'Asignatura', 'Nota', 'Componente Registrado', 'Nuevo Componente')
+    for j, title in enumerate(titles):
+        builder.add_run(0, j, title, bold=True)
+    for index, subject in enumerate(subjects, 1):
+        for j in range(5):
+            builder.add_run(index, j, subject[j])
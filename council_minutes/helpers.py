@@ -1,44 +1,70 @@
+import base64
+import binascii
+import copy
 import datetime
+import functools
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from bson import ObjectId, json_util
+from bson.errors import InvalidId
 from django.core.serializers.json import DjangoJSONEncoder
-from mongoengine.base.datastructures import BaseList, EmbeddedDocumentList
+from mongoengine.base import get_document
+from mongoengine.base.fields import ComplexBaseField
 from mongoengine.queryset import QuerySet
-from mongoengine.fields import BaseField
+from mongoengine.fields import BaseField, ListField, EmbeddedDocumentField, EmbeddedDocumentListField
+from mongoengine.fields import ReferenceField, LazyReferenceField, CachedReferenceField
+from mongoengine.fields import GenericReferenceField, GenericLazyReferenceField
 
 
 class QuerySetEncoder(DjangoJSONEncoder):
 
+    def __init__(self, *args, fields=None, **kwargs):
+        # Restricts the output to these fields, id and _cls are always kept
+        super().__init__(*args, **kwargs)
+        self.fields = fields
+
     # pylint: disable=method-hidden
     def default(self, obj):
         json_obj = {}
         json_obj['cases'] = []
         if isinstance(obj, QuerySet):
             for element in obj:
-                json_obj['cases'].append(
-                    QuerySetEncoder.encode_object(element))
+                if isinstance(element, dict):
+                    # Read with as_pymongo
+                    json_obj['cases'].append(
+                        QuerySetEncoder.encode_son(element, self.fields))
+                else:
+                    json_obj['cases'].append(
+                        QuerySetEncoder.encode_object(element, self.fields))
         else:
+            # Embedded documents, always encoded whole
             json_obj['cases'].append(QuerySetEncoder.encode_object(obj))
 
         return json_obj
 
     @staticmethod
-    def encode_object(obj):
+    def encode_object(obj, only=None):
         data = {}
-        fields = obj.__class__._fields
-        for key in fields:
-            value = obj[key]
-            if isinstance(value, BaseList):
-                if isinstance(value, EmbeddedDocumentList):
-                    data[key] = value
-                else:
-                    data[key] = [str(e) for e in value]
+        values = obj._data
+        for key, kind, embedded, choices, _ in encoder_plan(
+                obj.__class__, None if only is None else tuple(only)):
+            if kind == SCALAR:
+                value = values.get(key)
             else:
-                if key in fields and fields[key].choices is not None:
-                    for k, v in fields[key].choices:
-                        if k == value:
-                            data[key] = v
-                            break
-                else:
-                    data[key] = str(value)
+                value = values.get(key) if kind == LIST else obj[key]
+                if isinstance(value, list):
+                    data[key] = value if embedded else [str(e) for e in value]
+                    continue
+            if choices is not None:
+                # Values out of the choices are left out
+                try:
+                    data[key] = choices[value]
+                except (KeyError, TypeError):
+                    pass
+            else:
+                data[key] = str(value)
         try:
             data['_cls_display'] = obj.full_name
             data['decision_maker'] = obj.decision_maker
@@ -46,15 +72,192 @@ class QuerySetEncoder(DjangoJSONEncoder):
             pass
         return data
 
-def get_fields(_cls):
+    @staticmethod
+    def encode_son(son, only=None, _cls=None):
+        """
+        Encodes a raw document as read with as_pymongo, exactly as
+        encode_object encodes it once loaded, without building the Document:
+        missing values take the field default and the rest go through the
+        field's to_python. Embedded documents are encoded raw as well.
+        """
+        # Resolved as _from_son does, several embedded classes share a name
+        class_name = son.get('_cls')
+        if _cls is None or class_name not in (None, _cls._class_name):
+            _cls = get_document(class_name)
+        data = {}
+        for key, kind, embedded, choices, field in encoder_plan(
+                _cls, None if only is None else tuple(only)):
+            value = son.get(field.db_field)
+            if value is None:
+                value = field.default() if callable(field.default) else field.default
+            elif embedded:
+                document = field.field.document_type
+                data[key] = [{'cases': [QuerySetEncoder.encode_son(item, _cls=document)]}
+                             for item in value]
+                continue
+            else:
+                value = field.to_python(value)
+            if kind != SCALAR and isinstance(value, list):
+                data[key] = value if embedded else [str(e) for e in value]
+                continue
+            if choices is not None:
+                try:
+                    data[key] = choices[value]
+                except (KeyError, TypeError):
+                    pass
+            else:
+                data[key] = str(value)
+        try:
+            data['_cls_display'] = _cls.full_name
+            data['decision_maker'] = _cls.decision_maker
+        except AttributeError:
+            pass
+        return data
+
+
+def extended_json(value):
+    # Applies the bson extended JSON hook innermost first, like the
+    # json_util.loads with default options of Document.from_json
+    if isinstance(value, dict):
+        return json_util.object_hook({key: extended_json(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return [extended_json(item) for item in value]
+    return value
+
+
+def stream_cases(cases, fields=None, ndjson=False, chunk_size=100):
+    """
+    Yields raw cases, as read with as_pymongo, as JSON a chunk of cases at a
+    time: the same document JsonResponse writes with QuerySetEncoder, or one
+    case per line with ndjson.
+    """
+    encoder = QuerySetEncoder()
+    chunk = [] if ndjson else ['{"cases": [']
+    for index, son in enumerate(cases):
+        text = encoder.encode(QuerySetEncoder.encode_son(son, fields))
+        if ndjson:
+            chunk.append(text + '\n')
+        else:
+            chunk.append(text if index == 0 else ', ' + text)
+        if len(chunk) >= chunk_size:
+            yield ''.join(chunk)
+            chunk = []
+    if not ndjson:
+        chunk.append(']}')
+    if chunk:
+        yield ''.join(chunk)
+
+
+# How encode_object reads each field: straight from _data, scalars and
+# lists without references, or through the field, which dereferences
+SCALAR, LIST, DESCRIPTOR = range(3)
+REFERENCE_FIELDS = (ReferenceField, LazyReferenceField, CachedReferenceField,
+                    GenericReferenceField, GenericLazyReferenceField)
+
+
+def holds_references(field):
+    if isinstance(field, REFERENCE_FIELDS):
+        return True
+    if isinstance(field, ComplexBaseField):
+        return field.field is None or holds_references(field.field)
+    if isinstance(field, EmbeddedDocumentField):
+        return any(holds_references(inner)
+                   for inner in field.document_type._fields.values())
+    return False
+
+
+@functools.lru_cache(maxsize=1024)
+def encoder_plan(_cls, only=None):
+    """
+    How QuerySetEncoder encodes a class, compiled once: for each field in
+    order, its name, how to read it, whether it is a list of embedded
+    documents, its choices as a code to display dict, first display
+    winning, and the field itself.
+    """
+    plan = []
+    for name, field in _cls._fields.items():
+        if only is not None and name not in only and name not in ('id', '_cls'):
+            continue
+        if type(field).__get__ is BaseField.__get__:
+            kind = SCALAR
+        elif isinstance(field, ListField) and not holds_references(field):
+            kind = LIST
+        else:
+            kind = DESCRIPTOR
+        choices = None
+        if field.choices is not None:
+            choices = {}
+            for code, display in field.choices:
+                choices.setdefault(code, display)
+        plan.append((name, kind, isinstance(field, EmbeddedDocumentListField), choices, field))
+    return tuple(plan)
+
+
+def encode_cursor(object_id):
+    # Opaque to clients, the 12 bytes of the last _id of a page
+    return base64.urlsafe_b64encode(ObjectId(str(object_id)).binary).decode()
+
+
+def decode_cursor(cursor):
+    try:
+        return ObjectId(base64.urlsafe_b64decode(cursor.encode()))
+    except (binascii.Error, InvalidId, TypeError):
+        raise ValueError('Invalid cursor {}'.format(cursor))
+
+
+class LRUCache():
+    """
+    A thread safe least recently used cache bounded by the total size of its
+    values, as measured by sizeof. A max_size of 0 disables it.
+    """
+
+    def __init__(self, max_size, sizeof=len):
+        self.max_size = max_size
+        self.sizeof = sizeof
+        self.size = 0
+        self.__items = OrderedDict()
+        self.__lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.__items)
+
+    def get(self, key):
+        with self.__lock:
+            try:
+                self.__items.move_to_end(key)
+            except KeyError:
+                return None
+            return self.__items[key][0]
+
+    def put(self, key, value):
+        size = self.sizeof(value)
+        if size > self.max_size:
+            return
+        with self.__lock:
+            if key in self.__items:
+                self.size -= self.__items.pop(key)[1]
+            self.__items[key] = (value, size)
+            self.size += size
+            while self.size > self.max_size:
+                self.size -= self.__items.popitem(last=False)[1][1]
+
+    def clear(self):
+        with self.__lock:
+            self.__items.clear()
+            self.size = 0
+
+
+def get_fields(_cls, dynamic=None):
     schema = {
         'full_name': _cls.full_name,
         'decision_maker': _cls.decision_maker
         }
-    schema.update(get_schema(_cls))
+    schema.update(get_schema(_cls, dynamic))
     return schema
 
-def get_schema(_cls):
+def get_schema(_cls, dynamic=None, path=()):
+    # With a dynamic list, callable defaults are left as None and collected
+    # there along with their path in the schema, see SchemaBundle
     schema = {}
     fields = _cls._fields
     #Only if nedded
@@ -68,7 +271,11 @@ def get_schema(_cls):
 
             #Default can be a function, part of choices list or just a value
             if callable(field.default):
-                schema[name]['default'] = field.default()
+                if dynamic is None:
+                    schema[name]['default'] = field.default()
+                else:
+                    schema[name]['default'] = None
+                    dynamic.append((path + (name, 'default'), field.default))
             elif field.choices:
                 k = 'get_{}_display'.format(name)
                 schema[name]['default'] = obj.__dict__[k]()
@@ -81,9 +288,52 @@ def get_schema(_cls):
 
             if schema[name]['type'] == 'Table':
                 schema[name]['fields'] = get_schema(
-                    field.field.document_type_obj)
+                    field.field.document_type_obj, dynamic, path + (name, 'fields'))
     return schema
 
+
+class SchemaBundle():
+    """
+    The /infocase responses computed once: the list of cases, the schema of
+    every case and all the schemas together. Callable defaults, such as
+    today's date, are still evaluated on every request; a response is only
+    serialized again when their values change, and is served along with the
+    hash of its content as ETag.
+    """
+
+    CASE_LIST = ''
+    BUNDLE = '*'
+
+    def __init__(self, case_types, case_list):
+        self.__templates = {SchemaBundle.CASE_LIST: (case_list, ())}
+        bundle, bundle_dynamic = {}, []
+        for case_type in case_types:
+            dynamic = []
+            schema = get_fields(case_type.cls, dynamic)
+            self.__templates[case_type.code] = (schema, tuple(dynamic))
+            bundle[case_type.code] = schema
+            bundle_dynamic += [((case_type.code,) + path, default) for path, default in dynamic]
+        self.__templates[SchemaBundle.BUNDLE] = (bundle, tuple(bundle_dynamic))
+        self.__responses = {}
+
+    def get(self, key):
+        """Returns the body and ETag of a response, KeyError if unknown"""
+        template, dynamic = self.__templates[key]
+        values = [default() for _, default in dynamic]
+        values_key = json.dumps(values, cls=DjangoJSONEncoder)
+        cached = self.__responses.get(key)
+        if cached is None or cached[0] != values_key:
+            data = copy.deepcopy(template) if dynamic else template
+            for (path, _), value in zip(dynamic, values):
+                container = data
+                for step in path[:-1]:
+                    container = container[step]
+                container[path[-1]] = value
+            body = json.dumps(data, cls=DjangoJSONEncoder).encode()
+            cached = (values_key, body, '"{}"'.format(hashlib.sha1(body).hexdigest()))
+            self.__responses[key] = cached
+        return cached[1], cached[2]
+
 def clear_name(_cls):
     name = _cls.__class__.__name__
     if name == 'StringField':
@@ -0,0 +1,109 @@
+import os
+import time
+import datetime
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from ...models import GenerationJob
+from ...writter import UnifiedWritter, init_render_process, output_filename
+from ...writter import remove_old_outputs
+
+
+def render_job(jobid):
+    # pylint: disable=no-member
+    job = GenerationJob.get_job_by_id(jobid)
+    # The cases may have changed since the job was queued, and another job
+    # may have rendered the same content in the meantime
+    filename = output_filename(dict(job.query), job.pre)
+    if filename != job.filename:
+        GenerationJob.objects(id=job.id).update_one(set__filename=filename)
+    if os.path.exists(filename):
+        return
+    generator = UnifiedWritter(settings.GENERATION_PROCESSES)
+    generator.filename = filename
+    last_report = [0.0]
+
+    def report(done, total):
+        now = time.time()
+        if done == total or now - last_report[0] >= 1:
+            last_report[0] = now
+            GenerationJob.objects(id=job.id).update_one(
+                set__progress=done, set__total=total)
+
+    generator.progress = report
+    generator.generate_document_by_querie(dict(job.query), job.pre)
+
+
+def run_job(jobid):
+    # Whatever fails, the job ends marked as failed instead of running forever
+    try:
+        render_job(jobid)
+    except Exception as err:  # pylint: disable=broad-except
+        GenerationJob.objects(id=jobid).update_one(
+            set__status=GenerationJob.ST_FAILED, set__error=str(err),
+            set__finished=datetime.datetime.utcnow())
+    else:
+        GenerationJob.objects(id=jobid).update_one(
+            set__status=GenerationJob.ST_DONE,
+            set__finished=datetime.datetime.utcnow())
+    return jobid
+
+
+class Command(BaseCommand):
+
+    help = 'Renders the queued minutes generation jobs.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers', type=int, default=settings.GENERATION_WORKERS,
+            help='Maximum number of documents rendered at the same time.')
+        parser.add_argument(
+            '--poll', type=float, default=1.0,
+            help='Seconds to wait between polls when the queue is empty.')
+        parser.add_argument(
+            '--timeout', type=float, default=settings.GENERATION_TIMEOUT,
+            help='Seconds after which a running job is taken as abandoned.')
+
+    def clean_up(self, timeout):
+        stale = GenerationJob.fail_stale(timeout)
+        if stale:
+            self.stdout.write('Marked {} abandoned job(s) as failed.'.format(stale))
+        removed = remove_old_outputs(settings.GENERATION_RETENTION)
+        removed_jobs = GenerationJob.remove_finished(settings.GENERATION_RETENTION)
+        if removed or removed_jobs:
+            self.stdout.write('Removed {} old document(s) and {} finished job(s).'.format(
+                removed, removed_jobs))
+
+    def handle(self, *args, **options):
+        workers = max(1, options['workers'])
+        running = {}
+        context = multiprocessing.get_context('spawn')
+        # Jobs left running by a previous worker that was stopped or killed,
+        # and documents and jobs past their retention
+        self.clean_up(options['timeout'])
+        last_check = time.time()
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                 initializer=init_render_process) as pool:
+            self.stdout.write('Generation worker started with {} process(es).'.format(
+                workers))
+            while True:
+                for future in [future for future in running if future.done()]:
+                    jobid = running.pop(future)
+                    err = future.exception()
+                    if err is not None:
+                        # run_job could not record it, e.g. its process died
+                        self.stderr.write('Job {} failed: {!r}'.format(jobid, err))
+                        GenerationJob.objects(
+                            id=jobid, status=GenerationJob.ST_RUNNING).update_one(
+                                set__status=GenerationJob.ST_FAILED, set__error=str(err),
+                                set__finished=datetime.datetime.utcnow())
+                job = GenerationJob.claim_next() if len(running) < workers else None
+                if job is None:
+                    if time.time() - last_check >= 60:
+                        self.clean_up(options['timeout'])
+                        last_check = time.time()
+                    time.sleep(options['poll'])
+                    continue
+                self.stdout.write('Rendering job {} for {}'.format(job.id, job.user))
+                running[pool.submit(run_job, str(job.id))] = str(job.id)
@@ -0,0 +1,158 @@
+import csv
+import re
+from django.core.management.base import BaseCommand, CommandError
+from mongoengine.errors import ValidationError
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+from ...autofill import fold
+from ...models import Request, Person, SubjectAutofill
+
+
+# Each kind is upserted by its first field
+KINDS = {
+    'students': (Person, ('student_dni', 'student_dni_type', 'student_name')),
+    'subjects': (SubjectAutofill, ('subject_code', 'subject_name')),
+}
+DNI_TYPES = {fold(key).replace('.', ''): key for key, _ in Request.DNI_TYPE_CHOICES}
+DNI_TYPES.update({fold(value): key for key, value in Request.DNI_TYPE_CHOICES})
+
+
+def normalize_code(value):
+    '''DNIs and subject codes: no separators, no spreadsheet floats'''
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return re.sub(r"[\s.,']", '', str(value if value is not None else '')).upper()
+
+
+def normalize_dni_type(value):
+    # Either the code or the display of Request.DNI_TYPE_CHOICES, as SIA writes it
+    text = fold(str(value or ''))
+    return DNI_TYPES.get(text, DNI_TYPES.get(text.replace('.', ''), text.upper()))
+
+
+def normalize_text(value):
+    return ' '.join(str(value if value is not None else '').split())
+
+
+NORMALIZERS = {
+    'student_dni': normalize_code,
+    'student_dni_type': normalize_dni_type,
+    'subject_code': normalize_code,
+}
+
+
+def csv_rows(path, encoding, delimiter):
+    with open(path, newline='', encoding=encoding) as source:
+        if delimiter is None:
+            try:
+                delimiter = csv.Sniffer().sniff(source.read(4096), ',;\t|').delimiter
+            except csv.Error:
+                delimiter = ','
+            source.seek(0)
+        yield from csv.reader(source, delimiter=delimiter)
+
+
+def xlsx_rows(path):
+    try:
+        from openpyxl import load_workbook  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        raise CommandError('Reading .xlsx files needs openpyxl, pip install openpyxl.')
+    # Read only workbooks load the rows lazily
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        yield from workbook.active.iter_rows(values_only=True)
+    finally:
+        workbook.close()
+
+
+class Command(BaseCommand):
+
+    help = 'Inserts or updates the students or subjects of the autofill from a CSV or XLSX export.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=sorted(KINDS))
+        parser.add_argument('path', help='A .csv or .xlsx file, with a header row.')
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Rows sent to Mongo in each bulk write.')
+        parser.add_argument(
+            '--encoding', default='utf-8-sig', help='Encoding of a CSV file.')
+        parser.add_argument(
+            '--delimiter', help='Delimiter of a CSV file, guessed by default.')
+
+    def handle(self, *args, **options):
+        document, fields = KINDS[options['kind']]
+        self.document = document
+        self.counts = {'inserted': 0, 'updated': 0, 'unchanged': 0, 'skipped': 0, 'failed': 0}
+        if options['path'].lower().endswith('.xlsx'):
+            rows = xlsx_rows(options['path'])
+        else:
+            rows = csv_rows(options['path'], options['encoding'], options['delimiter'])
+        try:
+            header = next(rows)
+        except StopIteration:
+            raise CommandError('{} is empty.'.format(options['path']))
+        columns = self.columns(header, fields)
+        key = fields[0]
+        pending = {}
+        for line, row in enumerate(rows, 2):
+            values = {name: NORMALIZERS.get(name, normalize_text)(row[column])
+                      for name, column in columns.items() if column < len(row)}
+            if not values.get(key):
+                self.counts['skipped'] += 1
+                continue
+            try:
+                document(**values).validate()
+            except ValidationError as err:
+                self.counts['skipped'] += 1
+                self.stderr.write('Line {}: {}'.format(line, err))
+                continue
+            # A repeated key within a batch keeps its last row
+            pending[values[key]] = values
+            if len(pending) >= max(1, options['batch_size']):
+                self.flush(key, fields, pending)
+                pending = {}
+        self.flush(key, fields, pending)
+        self.stdout.write(', '.join(
+            '{} {}'.format(count, name) for name, count in self.counts.items()) + '.')
+
+    def columns(self, header, fields):
+        # Columns are named by field or by display, in any case and accents
+        names = {}
+        for name in fields:
+            names[fold(name)] = name
+            names[fold(self.document._fields[name].display)] = name
+        columns = {}
+        for column, title in enumerate(header):
+            name = names.get(fold(str(title or '')))
+            if name is not None and name not in columns:
+                columns[name] = column
+        if fields[0] not in columns:
+            raise CommandError('No "{}" column in the header.'.format(fields[0]))
+        return columns
+
+    def flush(self, key, fields, pending):
+        if not pending:
+            return
+        requests = []
+        for value, values in pending.items():
+            # Fields missing from the file keep their value, or get the default
+            defaults = {name: self.document._fields[name].default for name in fields
+                        if name not in values and self.document._fields[name].default is not None}
+            update = {'$set': values}
+            if defaults:
+                update['$setOnInsert'] = defaults
+            requests.append(UpdateOne({key: value}, update, upsert=True))
+        try:
+            # pylint: disable=protected-access
+            result = self.document._get_collection().bulk_write(
+                requests, ordered=False).bulk_api_result
+        except BulkWriteError as err:
+            result = err.details
+            self.counts['failed'] += len(result['writeErrors'])
+            for error in result['writeErrors']:
+                self.stderr.write('{}: {}'.format(
+                    list(pending)[error['index']], error['errmsg']))
+        self.counts['inserted'] += result['nUpserted']
+        self.counts['updated'] += result['nModified']
+        self.counts['unchanged'] += result['nMatched'] - result['nModified']
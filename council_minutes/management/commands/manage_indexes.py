@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand, CommandError
+from pymongo.errors import OperationFailure
+from ...models import Request, Person, SubjectAutofill, GenerationJob
+
+
+DOCUMENTS = (Request, Person, SubjectAutofill, GenerationJob)
+
+
+class Command(BaseCommand):
+
+    help = 'Creates the declared indexes and reports missing, undeclared and unused ones.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check', action='store_true',
+            help='Only report, fails if a declared index is missing.')
+
+    def handle(self, *args, **options):
+        missing = 0
+        for document in DOCUMENTS:
+            # pylint: disable=protected-access
+            collection = document._get_collection()
+            if not options['check']:
+                document.ensure_indexes()
+            comparison = document.compare_indexes()
+            for index in comparison['missing']:
+                missing += 1
+                self.stdout.write('{}: missing {}'.format(collection.name, index))
+            for index in comparison['extra']:
+                self.stdout.write('{}: not declared {}'.format(collection.name, index))
+            try:
+                stats = list(collection.aggregate([{'$indexStats': {}}]))
+            except OperationFailure as err:
+                self.stdout.write('{}: no index usage, {}'.format(collection.name, err))
+                continue
+            for index in stats:
+                # Counts start when the server starts or the index is built
+                if index['name'] != '_id_' and index['accesses']['ops'] == 0:
+                    self.stdout.write('{}: {} unused since {}'.format(
+                        collection.name, index['name'], index['accesses']['since']))
+        if options['check'] and missing:
+            raise CommandError('{} declared index(es) missing.'.format(missing))
+        self.stdout.write('Indexes checked.')
@@ -1,10 +1,14 @@
 import datetime
+import functools
 import json
 from mongoengine import DynamicDocument, EmbeddedDocument, DateField, StringField, BooleanField
 from mongoengine import ListField, IntField, EmbeddedDocumentField, EmbeddedDocumentListField
+from mongoengine import Document, DictField, DateTimeField
 from mongoengine.errors import ValidationError, DoesNotExist
 from mongoengine.fields import BaseField
-from.helpers import get_period_choices
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+from.helpers import get_period_choices, extended_json
 
 class Subject(EmbeddedDocument):
 
@@ -89,7 +93,26 @@ class Subject(EmbeddedDocument):
 
 class Request(DynamicDocument):
 
-    meta = {'allow_inheritance': True}
+    # The generation sorts by program and case type, and usually filters by
+    # program or by minute, so both are served in index order. 'cls': False
+    # keeps _cls out of the front of the keys, mongoengine also indexes _cls
+    # on its own for the implicit _cls $in of every query. Indexes are only
+    # created by the manage_indexes command, never on first access
+    meta = {
+        'allow_inheritance': True,
+        'auto_create_index': False,
+        'indexes': [
+            {'fields': ['academic_program', '_cls'], 'cls': False},
+            {'fields': ['consecutive_minute', 'year', 'academic_program', '_cls'], 'cls': False},
+            # Text search, see search_cases. Stems in spanish and ignores
+            # case and accents; without _cls, a text index can not follow an $in
+            {'fields': ['$student_name', '$student_dni', '$student_justification',
+                        '$council_decision', '$extra_analysis'],
+             'default_language': 'spanish',
+             'weights': {'student_name': 10, 'student_dni': 10},
+             'name': 'case_text', 'cls': False},
+        ]
+    }
 
     full_name = 'Petición sin tipo'
 
@@ -107,6 +130,10 @@ class Request(DynamicDocument):
     in_cm = True
     in_pcm = True
 
+    # Whether cm and pcm only read the case itself, renders of cases that
+    # read other documents are never cached
+    self_contained = True
+
     # AS Approval Status
     AS_APLAZA = 'AL'
     AS_APRUEBA = 'AP'
@@ -217,6 +244,10 @@ class Request(DynamicDocument):
     BAP_MEDICINA = 'BAPM'
     BAP_ENFERMERIA = 'BAPN'
     BAP_ODONTOLOGIA = 'BAPO'
+    # Undergraduate programs, the rest are postgraduate
+    PRE_PROGRAMS = (PI_AGRICOLA, PI_CIVIL, PI_DE_SISTEMAS_Y_COMPUTACION,
+                    PI_INDUSTRIAL, PI_ELECTRICA, PI_MECANICA,
+                    PI_MECATRONICA, PI_ELECTRONICA, PI_QUIMICA)
     PLAN_CHOICES = (
         (PI_CIVIL, 'Ingeniería Civil'),
         (PI_QUIMICA, 'Ingeniería Química'),
@@ -448,6 +479,10 @@ class Request(DynamicDocument):
         'CHOICES': '{} is not in choices list.'
     }
 
+    # Stored for bookkeeping, left out when loading cases to render them
+    NON_RENDER_FIELDS = ('date_stamp', 'user', 'consecutive_minute_ac', 'year',
+                         'student_dni_type', 'to_legal')
+
     str_analysis = 'Análisis'
     str_answer = 'Concepto'
     str_council_header = 'El Consejo de Facultad'
@@ -460,22 +495,112 @@ class Request(DynamicDocument):
         return self.advisor_response in (self.ARCR_RECOMENDAR, self.ARCR_APROBAR)
 
     def is_pre(self):
-        return self.academic_program in (self.PI_AGRICOLA, self.PI_CIVIL,
-                                         self.PI_DE_SISTEMAS_Y_COMPUTACION,
-                                         self.PI_INDUSTRIAL, self.PI_ELECTRICA, self.PI_MECANICA,
-                                         self.PI_MECATRONICA, self.PI_ELECTRONICA, self.PI_QUIMICA)
+        return self.academic_program in self.PRE_PROGRAMS
 
     def safe_save(self):
         try:
             self.save()
         except ValidationError as e:
             raise ValueError(e.message)
+        # pylint: disable=no-member
+        Request._get_collection().update_one({'_id': self.id}, {'$inc': {'_revision': 1}})
+
+    @staticmethod
+    def insert_cases(cases):
+        """
+        Writes already validated cases with a single unordered insert_many,
+        sets the id of the ones inserted and returns {position: error} for
+        the ones Mongo rejected.
+        """
+        documents = [case.to_mongo() for case in cases]
+        for document in documents:
+            # Counted by get_cases_version, mongoengine never loads it
+            document['_revision'] = 1
+        errors = {}
+        if documents:
+            try:
+                # pylint: disable=no-member
+                Request._get_collection().insert_many(documents, ordered=False)
+            except BulkWriteError as e:
+                for error in e.details['writeErrors']:
+                    errors[error['index']] = error['errmsg']
+        for position, (case, document) in enumerate(zip(cases, documents)):
+            if position not in errors:
+                case.id = document['_id']
+        return errors
+
+    @staticmethod
+    def update_cases(updates):
+        """
+        Writes every (stored, case) pair, the raw stored document and the
+        case replacing it, as a $set and $unset of only what changed, all in
+        a single unordered bulk_write. The stored document ends up as a save()
+        of the case would leave it, with its _revision increased. Returns
+        {position: error} for the pairs Mongo rejected.
+        """
+        operations = []
+        positions = []
+        for position, (stored, case) in enumerate(updates):
+            document = case.to_mongo()
+            update = {}
+            changed = {key: value for key, value in document.items()
+                       if key != '_id' and (key not in stored or stored[key] != value)}
+            if changed:
+                update['$set'] = changed
+            removed = {key: '' for key in stored
+                       if key not in document and key != '_revision'}
+            if removed:
+                update['$unset'] = removed
+            if update:
+                update['$inc'] = {'_revision': 1}
+                operations.append(UpdateOne({'_id': stored['_id']}, update))
+                positions.append(position)
+        errors = {}
+        if operations:
+            try:
+                # pylint: disable=no-member
+                Request._get_collection().bulk_write(operations, ordered=False)
+            except BulkWriteError as e:
+                for error in e.details['writeErrors']:
+                    errors[positions[error['index']]] = error['errmsg']
+        return errors
 
     @staticmethod
     def get_cases_by_query(query):
         # pylint: disable=no-member
         return Request.objects(**query).filter(approval_status__nin=[Request.AS_ANULADA, Request.AS_RENUNCIA])
 
+    @staticmethod
+    def get_cases_version(query):
+        """
+        A value that changes whenever a case of the query is inserted, edited
+        or deleted, computed by Mongo without sending the cases: how many
+        there are, the last _id and the sum of the _revision that
+        insert_cases, update_cases and safe_save keep.
+        """
+        # pylint: disable=no-member,protected-access
+        version = list(Request._get_collection().aggregate([
+            {'$match': Request.get_cases_by_query(query)._query},
+            {'$group': {'_id': None, 'count': {'$sum': 1}, 'last': {'$max': '$_id'},
+                        'revisions': {'$sum': '$_revision'}}}]))
+        if not version:
+            return [0, None, 0]
+        return [version[0]['count'], version[0]['last'], version[0]['revisions']]
+
+    @staticmethod
+    def search_cases(text, query):
+        '''The cases of the query matching text, the most relevant first'''
+        return Request.get_cases_by_query(query).search_text(text).order_by('$text_score')
+
+    @staticmethod
+    def get_render_fields():
+        # Every declared field of every case but the bookkeeping ones, no cm
+        # or pcm reads them. Dynamic keys are left out as well
+        # pylint: disable=import-outside-toplevel
+        from .registry import get_case_types
+        return [field for field in get_case_types().fields
+                if field not in Request.NON_RENDER_FIELDS]
+
     @staticmethod
     def get_case_by_id(caseid):
         try:
@@ -494,37 +619,74 @@ class Request(DynamicDocument):
 
     @staticmethod
     def get_cases():
+        # pylint: disable=import-outside-toplevel
+        from .registry import get_case_types
         return {
             'cases': [
-                {'code': type_case.__name__, 'name': type_case.full_name}
-                for type_case in Request.get_subclasses()]
+                {'code': case_type.code, 'name': case_type.full_name}
+                for case_type in get_case_types()]
         }
 
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def translation_plan(cls):
+        """
+        The display to code maps translate uses, compiled once per class:
+        field -> map for choice fields and field -> [(subfield, map)] for
+        lists of embedded documents. The first display wins in the former and
+        the last one in the latter, as the linear scans did.
+        """
+        plan = {}
+        # pylint: disable=no-member
+        for key, field in cls._fields.items():
+            if field.choices:
+                translations = {}
+                for code, display in field.choices:
+                    translations.setdefault(display, code)
+                plan[key] = translations
+            elif isinstance(field, EmbeddedDocumentListField):
+                _cls = field.field.document_type
+                plan[key] = [(name, dict((y, x) for x, y in subfield.choices))
+                             for name, subfield in _cls._fields.items() if subfield.choices]
+        return plan
+
     @classmethod
     def translate(cls, data):
-        data_json = json.loads(data)
-        for key in data_json:
+        """
+        Replaces the display values of choice fields by their codes. Takes
+        a dict, translated in place and returned, or its JSON, returned as
+        JSON as well.
+        """
+        if isinstance(data, str):
+            return json.dumps(cls.translate(json.loads(data)))
+        plan = cls.translation_plan()
+        for key, value in data.items():
+            translations = plan.get(key)
+            if translations is None:
+                continue
+            if isinstance(translations, dict):
+                try:
+                    data[key] = translations.get(value, value)
+                except TypeError:
+                    pass
+                continue
             try:
-                # pylint: disable=no-member
-                choices = cls._fields[key].choices
-                if choices:
-                    for item in choices:
-                        if item[1] == data_json[key]:
-                            data_json[key] = item[0]
-                            break
-                elif isinstance(cls._fields[key], EmbeddedDocumentListField):
-                    _cls = cls._fields[key].field.document_type_obj
-                    for field in _cls._fields:
-                        choices = _cls._fields[field].choices
-                        if choices:
-                            _dict = dict((y, x) for x, y in choices)
-                            for element in data_json[key]:
-                                if element[field] in _dict:
-                                    element[field] = _dict[element[field]]
-
+                for name, subtranslations in translations:
+                    for element in value:
+                        if element[name] in subtranslations:
+                            element[name] = subtranslations[element[name]]
             except KeyError:
+                # An element without the field stops the list, as it always did
                 pass
-        return json.dumps(data_json)
+        return data
+
+    @classmethod
+    def from_dict(cls, data, created=False):
+        """
+        Builds a case from a dict as from_json does from its JSON, extended
+        JSON values such as $oid or $date included.
+        """
+        return cls._from_son(extended_json(data), created=created)
 
     @classmethod
     def get_entire_name(cls):
@@ -554,6 +716,9 @@ class Professor(EmbeddedDocument):
 
 
 class Person(DynamicDocument):
+
+    meta = {'indexes': ['student_dni'], 'auto_create_index': False}
+
     student_dni_type = StringField(
         min_length=2, choices=Request.DNI_TYPE_CHOICES,
         default=Request.DNI_TYPE_CEDULA_DE_CIUDADANIA, display='Tipo de Documento')
@@ -563,8 +728,123 @@ class Person(DynamicDocument):
         max_length=512, display='Nombre del Estudiante', default='')
 
 class SubjectAutofill(DynamicDocument):
+
+    meta = {'indexes': ['subject_code'], 'auto_create_index': False}
+
     subject_code = StringField(
         display='Código de la Asignatura')
     subject_name = StringField(
         max_length=512, display='Nombre de la Asignatura', default='')
-        
\ No newline at end of file
+        
+
+
+class GenerationJob(Document):
+
+    # Workers poll for the oldest queued job, /generate looks for the job of
+    # a user that already produced a file
+    meta = {'collection': 'generation_job', 'auto_create_index': False,
+            'indexes': [('status', 'created'), ('filename', 'user')]}
+
+    ST_QUEUED = 'QU'
+    ST_RUNNING = 'RU'
+    ST_DONE = 'DO'
+    ST_FAILED = 'FA'
+    ST_CHOICES = (
+        (ST_QUEUED, 'En cola'),
+        (ST_RUNNING, 'Generando'),
+        (ST_DONE, 'Terminado'),
+        (ST_FAILED, 'Fallido'),
+    )
+
+    user = StringField(max_length=255, required=True)
+    query = DictField()
+    pre = BooleanField(default=False)
+    status = StringField(
+        min_length=2, max_length=2, choices=ST_CHOICES, default=ST_QUEUED)
+    progress = IntField(min_value=0, default=0)
+    total = IntField(min_value=0, default=0)
+    filename = StringField(default='')
+    error = StringField(default='')
+    created = DateTimeField(default=datetime.datetime.utcnow)
+    started = DateTimeField()
+    finished = DateTimeField()
+
+    def is_finished(self):
+        return self.status in (self.ST_DONE, self.ST_FAILED)
+
+    def as_dict(self):
+        data = {
+            'job': str(self.id),
+            # pylint: disable=no-member
+            'status': self.get_status_display(),
+            'progress': self.progress,
+            'total': self.total,
+        }
+        if self.status == self.ST_DONE:
+            data['url'] = self.filename
+        if self.status == self.ST_FAILED:
+            data['error'] = self.error
+        return data
+
+    @staticmethod
+    def enqueue(user, query, pre, filename, done=False):
+        """
+        Queues a generation into filename. With done=True the file already
+        exists and the job is recorded as finished right away.
+        """
+        job = GenerationJob(user=user, query=query, pre=pre, filename=filename)
+        if done:
+            job.status = GenerationJob.ST_DONE
+            job.started = job.finished = datetime.datetime.utcnow()
+        return job.save()
+
+    @staticmethod
+    def find_latest(user, filename):
+        '''The last job of the user producing filename, None if there is none'''
+        # pylint: disable=no-member
+        return GenerationJob.objects(user=user, filename=filename).order_by('-created').first()
+
+    @staticmethod
+    def remove_finished(seconds):
+        '''Deletes the jobs finished more than seconds ago, returns how many'''
+        finished = datetime.datetime.utcnow() - datetime.timedelta(seconds=seconds)
+        # pylint: disable=no-member
+        return GenerationJob.objects(
+            status__in=[GenerationJob.ST_DONE, GenerationJob.ST_FAILED],
+            finished__lt=finished).delete()
+
+    @staticmethod
+    def claim_next():
+        """
+        Atomically takes the oldest queued job and marks it as running, so
+        several workers can poll the same collection without sharing jobs.
+        Returns None when the queue is empty.
+        """
+        # pylint: disable=no-member
+        return GenerationJob.objects(status=GenerationJob.ST_QUEUED).order_by(
+            'created').modify(new=True, set__status=GenerationJob.ST_RUNNING,
+                              set__started=datetime.datetime.utcnow())
+
+    @staticmethod
+    def fail_stale(seconds):
+        """
+        Marks as failed the jobs running for longer than seconds, left behind
+        by a worker that stopped while rendering them. Returns how many.
+        """
+        now = datetime.datetime.utcnow()
+        # pylint: disable=no-member
+        return GenerationJob.objects(
+            status=GenerationJob.ST_RUNNING,
+            started__lt=now - datetime.timedelta(seconds=seconds)).update(
+                set__status=GenerationJob.ST_FAILED, set__finished=now,
+                set__error='The generation was interrupted, request it again')
+
+    @staticmethod
+    def get_job_by_id(jobid):
+        try:
+            # pylint: disable=no-member
+            return GenerationJob.objects.get(id=jobid)
+        except ValidationError as e:
+            raise ValueError(e.message)
+        except DoesNotExist:
+            raise KeyError('ID {} does not exist'.format(jobid))
@@ -0,0 +1,71 @@
+"""
+Every case class, indexed once when the app is ready (see
+apps.CouncilMinutesConfig) so resolving a case class never walks the class
+tree again.
+"""
+import importlib
+import pkgutil
+from collections import namedtuple
+from types import MappingProxyType
+from . import cases
+from .models import Request
+from .helpers import SchemaBundle
+
+
+CaseType = namedtuple('CaseType', [
+    'code', 'cls', 'entire_name', 'full_name', 'decision_maker', 'in_cm', 'in_pcm'])
+
+
+class CaseRegistry():
+    '''Read only lookups of the case classes by code, _cls name and class'''
+
+    def __init__(self, classes):
+        self.types = tuple(CaseType(
+            code=_cls.__name__,
+            cls=_cls,
+            entire_name=_cls.get_entire_name(),
+            full_name=_cls.full_name,
+            decision_maker=_cls.decision_maker,
+            in_cm=_cls.in_cm,
+            in_pcm=_cls.in_pcm) for _cls in classes)
+        self.by_code = MappingProxyType({case.code: case for case in self.types})
+        self.by_entire_name = MappingProxyType({case.entire_name: case for case in self.types})
+        self.by_cls = MappingProxyType({case.cls: case for case in self.types})
+        self.fields = tuple(sorted({name for case in self.types for name in case.cls._fields}))
+
+    def __iter__(self):
+        return iter(self.types)
+
+    def __len__(self):
+        return len(self.types)
+
+    def get(self, code):
+        '''The case type of a short code such as TRASPRE, KeyError if unknown'''
+        return self.by_code[code]
+
+
+_registry = None
+
+
+def get_case_types():
+    """
+    Imports every case module and builds the registry the first time, in
+    AppConfig.ready, and returns the same registry afterwards.
+    """
+    global _registry  # pylint: disable=global-statement
+    if _registry is None:
+        for module in pkgutil.iter_modules(cases.__path__):
+            importlib.import_module('{}.{}'.format(cases.__name__, module.name))
+        _registry = CaseRegistry(Request.get_subclasses())
+    return _registry
+
+
+_schemas = None
+
+
+def get_case_schemas():
+    """The /infocase responses, computed the first time like the registry"""
+    global _schemas  # pylint: disable=global-statement
+    if _schemas is None:
+        _schemas = SchemaBundle(get_case_types(), Request.get_cases())
+    return _schemas
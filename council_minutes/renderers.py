@@ -0,0 +1,440 @@
+"""
+Documents the case classes can write into instead of a python-docx Document.
+
+The cases only use a small part of the python-docx API: add_paragraph and
+add_table on the document; add_run, style, alignment and paragraph_format on
+paragraphs; font on runs; and cell, merge, width and vertical_alignment on
+tables. The classes below implement that same part over plain Python objects,
+so every cm and pcm renders into them unchanged:
+
+    HtmlDocument    keeps the content and serializes it as HTML, for previews
+    NullDocument    only counts what is written, to dry-run a whole council
+
+The docx backend is still python-docx itself, see writter.UnifiedWritter.
+"""
+import io
+import html
+import functools
+from docx import Document
+from docx.enum.style import WD_STYLE_TYPE
+from .cases.case_utils import header
+
+
+ALIGNMENTS = {0: 'left', 1: 'center', 2: 'right', 3: 'justify'}
+VERTICAL_ALIGNMENTS = {0: 'top', 1: 'middle', 3: 'bottom'}
+
+
+def check_text(text):
+    # python-docx only takes strings, keep failing where it would
+    if text and not isinstance(text, str):
+        raise TypeError('expected a string, got {}'.format(type(text).__name__))
+    return text or ''
+
+
+@functools.lru_cache(maxsize=None)
+def template_styles():
+    '''{name: type} of the styles of every generated document'''
+    from .writter import styled_template  # pylint: disable=import-outside-toplevel
+    return {style.name: style.type for style in Document(io.BytesIO(styled_template())).styles}
+
+
+def check_style(style, style_type):
+    # python-docx fails on styles the document does not have, or of another
+    # type, keep failing where it would so a dry run reports it
+    if style is None:
+        return style
+    name = style.name if isinstance(style, Style) else style
+    styles = template_styles()
+    if name not in styles:
+        raise KeyError("no style with name '{}'".format(name))
+    if styles[name] != style_type:
+        raise ValueError('assigned style is type {}, need type {}'.format(
+            styles[name], style_type))
+    return style
+
+
+class Attributes():
+    '''Takes any attribute, unset ones read as None like in python-docx'''
+
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        return None
+
+
+class Font(Attributes):
+
+    def __init__(self):
+        self.color = Attributes()
+
+
+class Style():
+
+    def __init__(self, name):
+        self.name = name
+        self.font = Font()
+
+
+class Run():
+
+    def __init__(self, text='', style=None):
+        self.text = check_text(text)
+        self.style = check_style(style, WD_STYLE_TYPE.CHARACTER)
+        self.font = Font()
+
+    @property
+    def bold(self):
+        return self.font.bold
+
+    @bold.setter
+    def bold(self, value):
+        self.font.bold = value
+
+    @property
+    def italic(self):
+        return self.font.italic
+
+    @italic.setter
+    def italic(self, value):
+        self.font.italic = value
+
+    @property
+    def underline(self):
+        return self.font.underline
+
+    @underline.setter
+    def underline(self, value):
+        self.font.underline = value
+
+
+class Hyperlink(Run):
+
+    def __init__(self, text, url):
+        super().__init__(text)
+        self.url = url
+
+
+class Paragraph():
+
+    def __init__(self, text='', style=None):
+        self.runs = []
+        self.style = style
+        self.alignment = None
+        self.paragraph_format = Attributes()
+        if text:
+            self.add_run(text)
+
+    @property
+    def style(self):
+        return self._style
+
+    @style.setter
+    def style(self, value):
+        self._style = check_style(value, WD_STYLE_TYPE.PARAGRAPH)
+
+    def add_run(self, text=None, style=None):
+        run = Run(text, style)
+        self.runs.append(run)
+        return run
+
+    def add_hyperlink(self, text, url):
+        '''Used by case_utils.add_hyperlink instead of editing the XML'''
+        hyperlink = Hyperlink(text, url)
+        self.runs.append(hyperlink)
+        return hyperlink
+
+    @property
+    def text(self):
+        return ''.join(run.text for run in self.runs)
+
+
+class Cell():
+
+    def __init__(self, table, row, col):
+        self.table = table
+        self.row = row
+        self.col = col
+        self.rowspan = 1
+        self.colspan = 1
+        self.width = None
+        self.vertical_alignment = None
+        self.paragraphs = [Paragraph()]
+
+    def add_paragraph(self, text='', style=None):
+        paragraph = Paragraph(text, style)
+        self.paragraphs.append(paragraph)
+        return paragraph
+
+    def merge(self, other):
+        return self.table.merge(self, other)
+
+    def is_empty(self):
+        return len(self.paragraphs) == 1 and not self.paragraphs[0].runs
+
+    @property
+    def text(self):
+        return '\n'.join(paragraph.text for paragraph in self.paragraphs)
+
+
+class Column():
+
+    def __init__(self, table, col):
+        self.table = table
+        self.col = col
+
+    @property
+    def cells(self):
+        return [row[self.col] for row in self.table.grid]
+
+    @property
+    def width(self):
+        return self.table.widths[self.col]
+
+    @width.setter
+    def width(self, value):
+        self.table.widths[self.col] = value
+
+
+class Table():
+
+    def __init__(self, rows, cols, style=None):
+        self.grid = [[Cell(self, row, col) for col in range(cols)] for row in range(rows)]
+        self.widths = [None] * cols
+        self.alignment = None
+        self.style = style
+
+    @property
+    def style(self):
+        return self._style
+
+    @style.setter
+    def style(self, value):
+        check_style(value, WD_STYLE_TYPE.TABLE)
+        self._style = value if isinstance(value, Style) else Style(value or 'Normal Table')
+
+    @property
+    def _cells(self):
+        return [cell for row in self.grid for cell in row]
+
+    @property
+    def columns(self):
+        return [Column(self, col) for col in range(len(self.widths))]
+
+    def cell(self, row, col):
+        return self.grid[row][col]
+
+    def merge(self, cell, other):
+        '''Merges the rectangle spanned by both cells as python-docx does:
+        the content of non empty cells ends up in the top left one'''
+        top, left = min(cell.row, other.row), min(cell.col, other.col)
+        bottom = max(cell.row + cell.rowspan, other.row + other.rowspan)
+        right = max(cell.col + cell.colspan, other.col + other.colspan)
+        origin = self.grid[top][left]
+        for row in range(top, bottom):
+            for col in range(left, right):
+                merged = self.grid[row][col]
+                if merged is origin:
+                    continue
+                if not merged.is_empty():
+                    if origin.is_empty():
+                        origin.paragraphs = []
+                    origin.paragraphs.extend(merged.paragraphs)
+                    merged.paragraphs = [Paragraph()]
+                self.grid[row][col] = origin
+        origin.rowspan, origin.colspan = bottom - top, right - left
+        return origin
+
+
+class BaseDocument():
+
+    def __init__(self):
+        self.paragraph_count = 0
+        self.table_count = 0
+
+    def add_paragraph(self, text='', style=None):
+        self.paragraph_count += 1
+        return Paragraph(check_text(text), style)
+
+    def add_table(self, rows, cols, style=None):
+        self.table_count += 1
+        return Table(rows, cols, style)
+
+
+class NullDocument(BaseDocument):
+    '''Drops what is written and only keeps the counts'''
+
+
+class HtmlDocument(BaseDocument):
+
+    def __init__(self):
+        super().__init__()
+        self.blocks = []
+
+    def add_paragraph(self, text='', style=None):
+        paragraph = super().add_paragraph(text, style)
+        self.blocks.append(paragraph)
+        return paragraph
+
+    def add_table(self, rows, cols, style=None):
+        table = super().add_table(rows, cols, style)
+        self.blocks.append(table)
+        return table
+
+    @property
+    def paragraphs(self):
+        return [block for block in self.blocks if isinstance(block, Paragraph)]
+
+    @property
+    def tables(self):
+        return [block for block in self.blocks if isinstance(block, Table)]
+
+    def html(self):
+        parts = []
+        open_list = None
+        for block in self.blocks:
+            style = block.style if isinstance(block, Paragraph) else None
+            if style is not None and style.startswith('List'):
+                if open_list != style:
+                    if open_list is not None:
+                        parts.append('</ul>')
+                    parts.append('<ul class="{}">'.format(css_class(style)))
+                    open_list = style
+                parts.append(paragraph_html(block, 'li'))
+                continue
+            if open_list is not None:
+                parts.append('</ul>')
+                open_list = None
+            if isinstance(block, Table):
+                parts.append(table_html(block))
+            elif style is not None and style.startswith('Heading'):
+                parts.append(paragraph_html(block, 'h' + style[-1]))
+            else:
+                parts.append(paragraph_html(block, 'p'))
+        if open_list is not None:
+            parts.append('</ul>')
+        return '<div class="acta">{}</div>'.format(''.join(parts))
+
+
+def css_class(style):
+    return style.lower().replace(' ', '-')
+
+
+def length_css(length):
+    # Lengths are EMU, 12700 per point
+    return '{:g}pt'.format(int(length) / 12700)
+
+
+def run_html(run):
+    text = html.escape(run.text).replace('\n', '<br>').replace('\t', '&emsp;')
+    if run.font.bold:
+        text = '<b>{}</b>'.format(text)
+    if run.font.italic:
+        text = '<i>{}</i>'.format(text)
+    if run.font.underline:
+        text = '<u>{}</u>'.format(text)
+    if run.font.size is not None:
+        text = '<span style="font-size:{}">{}</span>'.format(length_css(run.font.size), text)
+    if isinstance(run, Hyperlink):
+        text = '<a href="{}">{}</a>'.format(html.escape(run.url), text)
+    return text
+
+
+def paragraph_html(paragraph, tag):
+    alignment = paragraph.alignment
+    if alignment is None:
+        alignment = paragraph.paragraph_format.alignment
+    style = ''
+    if alignment is not None and int(alignment) in ALIGNMENTS:
+        style = ' style="text-align:{}"'.format(ALIGNMENTS[int(alignment)])
+    return '<{0}{1}>{2}</{0}>'.format(
+        tag, style, ''.join(run_html(run) for run in paragraph.runs))
+
+
+def table_html(table):
+    rows = []
+    written = set()
+    for row in table.grid:
+        cells = []
+        for cell in row:
+            if id(cell) in written:
+                continue
+            written.add(id(cell))
+            attributes = ''
+            if cell.rowspan > 1:
+                attributes += ' rowspan="{}"'.format(cell.rowspan)
+            if cell.colspan > 1:
+                attributes += ' colspan="{}"'.format(cell.colspan)
+            styles = []
+            if cell.width is not None and cell.colspan == 1:
+                styles.append('width:' + length_css(cell.width))
+            if cell.vertical_alignment is not None and \
+                    int(cell.vertical_alignment) in VERTICAL_ALIGNMENTS:
+                styles.append('vertical-align:' + VERTICAL_ALIGNMENTS[int(cell.vertical_alignment)])
+            if styles:
+                attributes += ' style="{}"'.format(';'.join(styles))
+            cells.append('<td{}>{}</td>'.format(attributes, ''.join(
+                paragraph_html(paragraph, 'p') for paragraph in cell.paragraphs)))
+        rows.append('<tr>{}</tr>'.format(''.join(cells)))
+    return '<table class="{}">{}</table>'.format(css_class(table.style.name), ''.join(rows))
+
+
+def render_case(document, case, pcm):
+    '''Writes the cm or the pcm of a case into a document of any backend'''
+    if pcm:
+        header(case, document)
+        case.pcm(document)
+    else:
+        case.cm(document)
+
+
+def write_case(document, case, pcm):
+    '''Like render_case, but a failing case writes its error instead and
+    returns False'''
+    try:
+        render_case(document, case, pcm)
+    except NotImplementedError:
+        document.add_paragraph()
+        document.add_paragraph(
+            'Not Implemented case {}'.format(case.full_name))
+        document.add_paragraph()
+    except Exception as err:  # pylint: disable=broad-except
+        document.add_paragraph()
+        document.add_paragraph(
+            'Error en el acta {}'.format(case.id))
+        document.add_paragraph('Trace: {}'.format(err))
+        document.add_paragraph()
+    else:
+        return True
+    return False
+
+
+def case_html(case, pcm):
+    document = HtmlDocument()
+    write_case(document, case, pcm)
+    return document.html()
+
+
+def dry_run(cases, pcm):
+    """
+    Renders every case into a NullDocument and returns the totals and every
+    error found, the same ones a real generation would write in the minutes.
+    """
+    document = NullDocument()
+    errors = []
+    total = 0
+    for case in cases:
+        total += 1
+        try:
+            render_case(document, case, pcm)
+        except NotImplementedError:
+            errors.append({'id': str(case.id), 'case': case.full_name,
+                           'error': 'Not Implemented case'})
+        except Exception as err:  # pylint: disable=broad-except
+            errors.append({'id': str(case.id), 'case': case.full_name,
+                           'error': str(err)})
+    return {
+        'cases': total,
+        'paragraphs': document.paragraph_count,
+        'tables': document.table_count,
+        'errors': errors,
+    }
@@ -1,6 +1,53 @@
+import os
+import json
+import time
+import datetime
+import tempfile
+from unittest import mock, skipIf
+from bson import ObjectId
+from pymongo import UpdateOne
 from docx import Document
-from django.test import TestCase
-from council_minutes.models import Subject, Request, Professor
+from django.core.serializers.json import DjangoJSONEncoder
+from django.contrib.auth.models import User
+from django.test import TestCase, SimpleTestCase, override_settings
+from rest_framework.test import APIRequestFactory, force_authenticate
+from council_minutes import views
+from council_minutes.models import Subject, Request, Professor, GenerationJob, Person
+from council_minutes.helpers import LRUCache, QuerySetEncoder, SchemaBundle, encoder_plan, get_fields
+from council_minutes.helpers import encode_cursor, decode_cursor, stream_cases
+from council_minutes.cases.case_utils import TableBuilder, add_hyperlink
+from council_minutes.cases.TRASPRE import TRASPRE
+from council_minutes.renderers import HtmlDocument, NullDocument
+from council_minutes.writter import UnifiedWritter, remove_old_outputs
+from council_minutes.cases.REEM import REEM
+from council_minutes.registry import get_case_types, get_case_schemas
+from council_minutes.autofill import fold, prefix_keys, PrefixIndex
+from council_minutes.management.commands.import_autofill import normalize_code, normalize_dni_type
+try:
+    import mongomock
+except ImportError:
+    mongomock = None
+
+
+def document_tree(document):
+    yield document
+    for subclass in document.__subclasses__():
+        yield from document_tree(subclass)
+
+
+@skipIf(mongomock is None, 'mongomock is not installed')
+class MockedMongoTestCase(SimpleTestCase):
+    '''Points the documents, and their subclasses, to an empty in-memory database'''
+
+    documents = ()
+
+    def setUp(self):
+        database = mongomock.MongoClient().db
+        for document in self.documents:
+            collection = database[document._get_collection_name()]
+            for _cls in document_tree(document):
+                _cls._collection = collection
+                self.addCleanup(setattr, _cls, '_collection', None)
 
 
 class TestCases(TestCase):
@@ -88,3 +135,383 @@ class TestCases(TestCase):
             request = Request.objects.get(id=unique_id)
             print(unique_id)
             request.pcm(document)
+
+
+class TestLRUCache(SimpleTestCase):
+
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(6)
+        cache.put('a', 'aa')
+        cache.put('b', 'bb')
+        cache.get('a')
+        cache.put('c', 'cc')
+        cache.put('d', 'dd')
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), 'aa')
+        self.assertEqual(cache.size, 6)
+
+    def test_replaces_and_skips_oversized_values(self):
+        cache = LRUCache(4)
+        cache.put('a', 'aaa')
+        cache.put('a', 'a')
+        cache.put('b', 'bbbbb')
+        self.assertEqual(cache.get('a'), 'a')
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.size, 1)
+
+
+class TestTableBuilder(SimpleTestCase):
+
+    def test_grid_matches_table_after_merges(self):
+        builder = TableBuilder(Document(), 4, 3, style='Table Grid')
+        builder.merge(0, 0, 0, 2)
+        builder.merge(1, 0, 3, 0)
+        builder.set_widths([400000, 2400000, 2400000])
+        table = builder.table
+        for row in range(4):
+            for col in range(3):
+                # pylint: disable=protected-access
+                self.assertIs(builder.cell(row, col)._tc, table.cell(row, col)._tc)
+        self.assertEqual(table.cell(2, 1).width, table.columns[1].width)
+        self.assertEqual(table.cell(3, 2).width, table.columns[2].width)
+
+
+class TestRenderers(SimpleTestCase):
+
+    def test_html_document_renders_tables_and_links(self):
+        document = HtmlDocument()
+        builder = TableBuilder(document, 2, 2, style='Table Grid')
+        builder.add_run(0, 0, 'a', bold=True)
+        builder.add_run(0, 1, 'b')
+        builder.merge(0, 0, 0, 1)
+        builder.add_run(1, 0, 'c & d')
+        add_hyperlink(document.add_paragraph(style='List Hyperlink'), 'Acuerdo', 'http://x')
+        html = document.html()
+        self.assertIn('<td colspan="2"><p><b>a</b></p><p>b</p></td>', html)
+        self.assertIn('c &amp; d', html)
+        self.assertIn('<ul class="list-hyperlink"><li><a href="http://x">Acuerdo</a></li></ul>', html)
+
+    def test_null_document_counts_and_keeps_docx_errors(self):
+        document = NullDocument()
+        document.add_paragraph('text').add_run(' more').font.bold = True
+        TableBuilder(document, 1, 1)
+        self.assertEqual((document.paragraph_count, document.table_count), (1, 1))
+        with self.assertRaises(TypeError):
+            document.add_paragraph().add_run(3)
+
+    def test_null_document_rejects_styles_the_template_lacks(self):
+        document = NullDocument()
+        document.add_paragraph('a', style='List Bullet 2').style = 'List Hyperlink'
+        TableBuilder(document, 1, 1, style='Table Grid')
+        with self.assertRaises(KeyError):
+            document.add_paragraph('a', style='Missing Style')
+        with self.assertRaises(KeyError):
+            document.add_paragraph('a').style = 'Missing Style'
+        with self.assertRaises(ValueError):
+            TableBuilder(document, 1, 1, style='List Bullet')
+
+    def test_only_successful_self_contained_renders_are_cached(self):
+        class Written():
+            full_name = 'Caso'
+
+            def cm(self, docx):
+                docx.add_paragraph('texto')
+
+        writter = UnifiedWritter()
+        self.assertEqual(len(writter.capture_case(Written(), False)[0]), 1)
+        # Request has no cm, its error is written but not returned
+        self.assertIsNone(writter.capture_case(Request(), False))
+        self.assertIn('Error en el acta', writter.document.paragraphs[-3].text)
+        self.assertFalse(REEM.self_contained)
+
+
+class TestQuerySetEncoder(SimpleTestCase):
+
+    def test_fields_restrict_the_output(self):
+        case = TRASPRE(
+            student_name='Juan', academic_program=Request.PI_CIVIL, user='juan')
+        data = QuerySetEncoder.encode_object(case, ['student_name', 'academic_program'])
+        self.assertEqual(data['student_name'], 'Juan')
+        self.assertEqual(data['academic_program'], 'Ingeniería Civil')
+        self.assertNotIn('user', data)
+        self.assertIn('_cls', data)
+        self.assertIn('user', QuerySetEncoder.encode_object(case))
+
+    def test_plans_keep_the_encoding(self):
+        case = TRASPRE(student_name='Juan', academic_program='XXXX',
+                       extra_analysis=['a', 'b'])
+        data = QuerySetEncoder.encode_object(case)
+        self.assertNotIn('academic_program', data)
+        self.assertEqual(data['extra_analysis'], ['a', 'b'])
+        self.assertEqual(data['student_name'], 'Juan')
+        self.assertIs(encoder_plan(TRASPRE), encoder_plan(TRASPRE))
+
+    def test_raw_documents_encode_like_loaded_ones(self):
+        case = TRASPRE(student_name='Juan', academic_program=Request.PI_CIVIL,
+                       equivalence=[TRASPRE.HomologatedSubject(name='Cálculo', credits=4)])
+        son = case.to_mongo().to_dict()
+        self.assertEqual(json.dumps(QuerySetEncoder.encode_son(son), cls=QuerySetEncoder),
+                         json.dumps(QuerySetEncoder.encode_object(case), cls=QuerySetEncoder))
+
+    def test_streamed_cases_match_the_response(self):
+        sons = [TRASPRE(student_name=name).to_mongo().to_dict() for name in ('a', 'b', 'c')]
+        expected = json.dumps({'cases': [QuerySetEncoder.encode_son(son) for son in sons]},
+                              cls=QuerySetEncoder)
+        self.assertEqual(''.join(stream_cases(sons, chunk_size=2)), expected)
+        lines = ''.join(stream_cases(sons, ndjson=True)).splitlines()
+        self.assertEqual([json.loads(line)['student_name'] for line in lines], ['a', 'b', 'c'])
+
+    def test_render_fields_skip_bookkeeping(self):
+        fields = Request.get_render_fields()
+        self.assertIn('student_name', fields)
+        self.assertFalse(set(fields) & set(Request.NON_RENDER_FIELDS))
+
+    def test_cursor_round_trip(self):
+        object_id = '5d83c4ec6a12d53c1de1b85c'
+        self.assertEqual(str(decode_cursor(encode_cursor(object_id))), object_id)
+        with self.assertRaises(ValueError):
+            decode_cursor('abc')
+
+
+class TestCaseRegistry(SimpleTestCase):
+
+    def test_registry_indexes_every_case(self):
+        case_types = get_case_types()
+        self.assertIs(case_types, get_case_types())
+        case_type = case_types.get('TRASPRE')
+        self.assertIs(case_type.cls, TRASPRE)
+        self.assertEqual(case_type.entire_name, TRASPRE.get_entire_name())
+        self.assertIs(case_types.by_entire_name[case_type.entire_name], case_type)
+        self.assertEqual(len(case_types), len(Request.get_subclasses()))
+        with self.assertRaises(KeyError):
+            case_types.get('NOPE')
+
+    def test_schemas_match_get_fields(self):
+        schemas = get_case_schemas()
+        body, etag = schemas.get('TRASPRE')
+        self.assertEqual(json.loads(body), json.loads(json.dumps(
+            get_fields(TRASPRE), cls=DjangoJSONEncoder)))
+        self.assertEqual(schemas.get('TRASPRE'), (body, etag))
+        self.assertEqual(json.loads(schemas.get(SchemaBundle.BUNDLE)[0])['TRASPRE'],
+                         json.loads(body))
+
+
+class TestTranslate(SimpleTestCase):
+
+    def test_translates_dicts_and_json(self):
+        item = {'academic_program': 'Ingeniería Civil', 'student_name': 'Juan',
+                'equivalence': [{'tipology': 'Disciplinar Optativa (T)'}, {'tipology': 'XX'}]}
+        translated = TRASPRE.translate(json.loads(json.dumps(item)))
+        self.assertEqual(translated['academic_program'], Request.PI_CIVIL)
+        self.assertEqual(translated['student_name'], 'Juan')
+        self.assertEqual(translated['equivalence'][0]['tipology'], Subject.TIP_PRE_DISC_OPTATIVA)
+        self.assertEqual(translated['equivalence'][1]['tipology'], 'XX')
+        self.assertEqual(json.loads(TRASPRE.translate(json.dumps(item))), translated)
+
+    def test_from_dict_matches_from_json(self):
+        item = {'_cls': 'Request.TRASPRE', 'student_name': 'Juan',
+                'id': {'$oid': '5d83c4ec6a12d53c1de1b85c'}, 'date': {'$date': 1570000000000}}
+        self.assertEqual(TRASPRE.from_dict(item).to_mongo(),
+                         TRASPRE.from_json(json.dumps(item)).to_mongo())
+
+
+class TestAutofillIndex(SimpleTestCase):
+
+    def test_keys_fold_accents_and_start_at_every_word(self):
+        self.assertEqual(fold('  José  ÁLVAREZ '), 'jose alvarez')
+        self.assertEqual(prefix_keys('Juan García López'),
+                         {'juan garcia lopez', 'garcia lopez', 'lopez'})
+        self.assertEqual(prefix_keys(''), set())
+        self.assertEqual(prefix_keys(None), set())
+        self.assertEqual(fold(1018), '1018')
+
+    def test_import_normalizes_codes_and_dni_types(self):
+        self.assertEqual(normalize_code(' 1.018.456.789 '), '1018456789')
+        self.assertEqual(normalize_code(2015734.0), '2015734')
+        self.assertEqual(normalize_code("'ab 123"), 'AB123')
+        self.assertEqual(normalize_dni_type('C.C.'), 'CC')
+        self.assertEqual(normalize_dni_type('Cédula de extranjería'), 'CE')
+        self.assertEqual(normalize_dni_type('xx'), 'XX')
+
+
+class TestGenerationQueue(MockedMongoTestCase):
+
+    documents = (GenerationJob,)
+
+    def test_claims_never_share_a_job(self):
+        for _ in range(3):
+            GenerationJob.enqueue('user', {'year': 2019}, False, 'acta.docx')
+        claimed = [GenerationJob.claim_next() for _ in range(4)]
+        self.assertIsNone(claimed[3])
+        self.assertEqual(len({job.id for job in claimed[:3]}), 3)
+        # pylint: disable=no-member
+        self.assertEqual(GenerationJob.objects(status=GenerationJob.ST_RUNNING).count(), 3)
+
+    def test_abandoned_jobs_are_failed(self):
+        GenerationJob.enqueue('user', {}, False, 'acta.docx')
+        GenerationJob.enqueue('user', {}, False, 'acta.docx')
+        old, recent = GenerationJob.claim_next(), GenerationJob.claim_next()
+        # pylint: disable=no-member
+        GenerationJob.objects(id=old.id).update_one(
+            set__started=datetime.datetime.utcnow() - datetime.timedelta(hours=2))
+        self.assertEqual(GenerationJob.fail_stale(3600), 1)
+        self.assertEqual(GenerationJob.objects.get(id=old.id).status, GenerationJob.ST_FAILED)
+        self.assertEqual(GenerationJob.objects.get(id=recent.id).status, GenerationJob.ST_RUNNING)
+
+    def test_old_outputs_and_jobs_are_removed(self):
+        with tempfile.TemporaryDirectory() as directory:
+            old, recent = os.path.join(directory, 'a.docx'), os.path.join(directory, 'b.docx')
+            for filename in (old, recent):
+                open(filename, 'wb').close()
+            os.utime(old, (time.time() - 7200, time.time() - 7200))
+            self.assertEqual(remove_old_outputs(3600, directory), 1)
+            self.assertEqual(os.listdir(directory), ['b.docx'])
+        job = GenerationJob.enqueue('user', {}, False, 'acta.docx', done=True)
+        self.assertEqual(GenerationJob.remove_finished(3600), 0)
+        # pylint: disable=no-member
+        GenerationJob.objects(id=job.id).update_one(
+            set__finished=datetime.datetime.utcnow() - datetime.timedelta(hours=2))
+        self.assertEqual(GenerationJob.remove_finished(3600), 1)
+
+
+class TestAutofillSearch(MockedMongoTestCase):
+
+    documents = (Person,)
+
+    def setUp(self):
+        super().setUp()
+        self.index = PrefixIndex(Person, ('student_dni', 'student_name'),
+                                 ('student_dni', 'student_name'))
+
+    def names(self, text):
+        return [record['student_name'] for record in self.index.search(text)]
+
+    def test_rebuild_takes_in_updates_and_deletions(self):
+        # pylint: disable=no-member
+        juan = Person(student_dni='1', student_name='Juan García').save()
+        Person(student_dni='2', student_name=None).save()
+        self.assertEqual(self.names('garc'), ['Juan García'])
+        Person(student_dni='3', student_name='Ana Gómez').save()
+        self.index.refresh()
+        self.assertEqual(self.names('gom'), ['Ana Gómez'])
+        Person.objects(id=juan.id).update_one(set__student_name='Juan Pérez')
+        Person.objects(student_dni='3').delete()
+        self.index.refresh(rebuild=True)
+        self.assertEqual(self.names('garc'), [])
+        self.assertEqual(self.names('perez'), ['Juan Pérez'])
+        self.assertEqual(self.names('gom'), [])
+
+    def test_due_refreshes_run_in_the_background(self):
+        Person(student_dni='1', student_name='Juan García').save()
+        self.assertEqual(self.names('juan'), ['Juan García'])
+        Person(student_dni='2', student_name='Juan Pérez').save()
+        with override_settings(AUTOFILL_REFRESH=0), \
+                mock.patch('council_minutes.autofill.threading.Thread') as thread:
+            # Served from the current index while the refresh is started
+            self.assertEqual(self.names('juan'), ['Juan García'])
+            self.assertEqual(self.names('juan'), ['Juan García'])
+        thread.assert_called_once()
+        thread.return_value.start.assert_called_once()
+        target, args = thread.call_args[1]['target'], thread.call_args[1]['args']
+        target(*args)
+        self.assertEqual(self.names('juan'), ['Juan García', 'Juan Pérez'])
+
+
+class TestBulkWrites(MockedMongoTestCase):
+
+    documents = (Request,)
+
+    def test_insert_cases_reports_rejected_positions(self):
+        first = TRASPRE(student_name='Ana')
+        self.assertEqual(Request.insert_cases([first]), {})
+        repeated = TRASPRE(id=first.id, student_name='Ana otra vez')
+        cases = [TRASPRE(student_name='Luis'), repeated, TRASPRE(student_name='Eva')]
+        errors = Request.insert_cases(cases)
+        self.assertEqual(list(errors), [1])
+        self.assertIsNotNone(cases[0].id)
+        self.assertIsNotNone(cases[2].id)
+        # pylint: disable=no-member
+        self.assertEqual(sorted(case['student_name'] for case in Request.objects.as_pymongo()),
+                         ['Ana', 'Eva', 'Luis'])
+
+    def test_post_reports_failed_items_by_index(self):
+        items = [{'_cls': 'TRASPRE', 'student_name': 'Ana'},
+                 {'_cls': 'NOPE'},
+                 {'_cls': 'TRASPRE', 'student_dni_type': 'XX'},
+                 {'_cls': ['TRASPRE']}]
+        request = APIRequestFactory().post('/case', {'items': items}, format='json')
+        force_authenticate(request, user=User(username='tester'))
+        data = json.loads(views.case(request).content)
+        self.assertEqual(len(data['inserted_items']), 1)
+        self.assertEqual([item['index'] for item in data['failed_items']], [1, 2, 3])
+        self.assertEqual(data['errors'], [item['error'] for item in data['failed_items']])
+        # pylint: disable=no-member
+        self.assertEqual(Request.objects.get(id=data['inserted_items'][0]).user, 'tester')
+
+    def test_update_cases_sets_and_unsets_only_what_changed(self):
+        stored_case = REEM(student_name='Ana', cancelation_case=ObjectId(), percentage=50.0)
+        Request.insert_cases([stored_case])
+        collection = Request._get_collection()  # pylint: disable=protected-access
+        collection.update_one({'_id': stored_case.id}, {'$set': {'legacy': 1}})
+        stored = collection.find_one({'_id': stored_case.id})
+        # Cleared to its default, None, so to_mongo leaves it out, and a
+        # dynamic key dropped from the edit
+        item = dict(stored, student_name='Ana María', cancelation_case=None)
+        del item['legacy']
+        case = REEM.from_dict(item, created=True)
+        # mongomock's bulk_write does not take what pymongo 4 sends, the
+        # captured update is applied on its own instead
+        with mock.patch('council_minutes.models.UpdateOne', wraps=UpdateOne) as update_one, \
+                mock.patch.object(collection, 'bulk_write') as write:
+            self.assertEqual(Request.update_cases([(stored, case)]), {})
+        write.assert_called_once()
+        query, update = update_one.call_args[0]
+        self.assertEqual(update['$set'], {'student_name': 'Ana María'})
+        self.assertEqual(update['$unset'], {'cancelation_case': '', 'legacy': ''})
+        self.assertEqual(update['$inc'], {'_revision': 1})
+        collection.update_one(query, update)
+        self.assertEqual(collection.find_one({'_id': case.id}),
+                         dict(case.to_mongo().to_dict(), _revision=2))
+        # Nothing changed, nothing is written
+        stored = collection.find_one({'_id': case.id})
+        with mock.patch.object(collection, 'bulk_write') as write:
+            self.assertEqual(Request.update_cases([(stored, case)]), {})
+        write.assert_not_called()
+
+
+class TestAutofillResolve(MockedMongoTestCase):
+
+    documents = (Person,)
+
+    def test_resolve_reports_found_and_missing(self):
+        Person(student_dni='1', student_name='Ana').save()
+        Person(student_dni='1', student_name='Ana repetida').save()
+        Person(student_dni='2', student_name='Luis').save()
+        index = PrefixIndex(Person, ('student_dni', 'student_name'), ('student_name',))
+        found, missing = index.resolve(['1', 2, '9', '1'])
+        self.assertEqual(found, {'1': {'student_dni': '1', 'student_name': 'Ana'},
+                                 '2': {'student_dni': '2', 'student_name': 'Luis'}})
+        self.assertEqual(missing, ['9'])
+        self.assertEqual(index.resolve([]), ({}, []))
+
+
+class TestCasesVersion(MockedMongoTestCase):
+
+    documents = (Request,)
+
+    def test_version_changes_with_every_write(self):
+        query = {'academic_program': Request.PI_AGRICOLA}
+        self.assertEqual(Request.get_cases_version(query), [0, None, 0])
+        case = TRASPRE(student_name='Ana')
+        Request.insert_cases([case, TRASPRE(student_name='Luis')])
+        inserted = Request.get_cases_version(query)
+        self.assertEqual(inserted[0], 2)
+        collection = Request._get_collection()  # pylint: disable=protected-access
+        stored = collection.find_one({'_id': case.id})
+        edited = TRASPRE.from_dict(dict(stored, student_name='Ana María'), created=True)
+        with mock.patch.object(collection, 'bulk_write'), \
+                mock.patch('council_minutes.models.UpdateOne', wraps=UpdateOne) as update_one:
+            Request.update_cases([(stored, edited)])
+        collection.update_one(*update_one.call_args[0])
+        self.assertNotEqual(Request.get_cases_version(query), inserted)
+        self.assertEqual(Request.get_cases_version({'academic_program': 'x'}), [0, None, 0])
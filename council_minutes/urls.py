@@ -12,11 +12,20 @@ urlpatterns = [
     path('details', views.details, name='Details'),
     path('infocase', views.info_cases, name='Info about cases'),
     path('case', views.case, name='Case object manipulation'),
+    path('case/search', views.case_search, name='Case full text search'),
 
     path('allow_generate', views.allow_generate, name='allow_generate'),
     path('generate', views.get_docx_genquerie,
          name='Docx generation by case query'),
+    path('generate/status/<str:job_id>', views.generation_status,
+         name='Docx generation job status'),
+    path('generate/download/<str:job_id>', views.generation_download,
+         name='Docx generation job download'),
+    path('preview/<str:case_id>', views.preview_case,
+         name='Docx preview of a single case'),
     path('generate_spec', views.generate_spec, name='generate_spec'),
-    path('autofill', views.autofill, name='autofill')
+    path('autofill', views.autofill, name='autofill'),
+    path('autofill/search', views.autofill_search, name='autofill_search'),
+    path('autofill/batch', views.autofill_batch, name='autofill_batch')
 
 ] + static(settings.STATIC_URL, document_root=settings.STATICFILES_DIRS)
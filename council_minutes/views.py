@@ -1,6 +1,7 @@
 # pylint: disable=wildcard-import,unused-wildcard-import
+import io
+import os
 import json
-import datetime
 from django.contrib.auth import logout
 from django.contrib.auth.models import User
 from django_auth_ldap.backend import LDAPBackend
@@ -8,12 +9,20 @@ from rest_framework.authtoken.models import Token
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.status import *
+from bson import ObjectId
+from django.conf import settings
 from django.core.exceptions import ObjectDoesNotExist
-from django.http import JsonResponse
+from django.http import JsonResponse, FileResponse, HttpResponse, StreamingHttpResponse
+from django.http import HttpResponseNotModified
+from django.utils.http import parse_etags
 from mongoengine.errors import ValidationError
-from .models import Request, Person, SubjectAutofill
-from .helpers import QuerySetEncoder, get_fields, get_period_choices, get_queries_by_groups
-from .writter import UnifiedWritter
+from .models import Request, Person, SubjectAutofill, GenerationJob
+from .writter import UnifiedWritter, output_filename, case_preview, DOCX_CONTENT_TYPE
+from .renderers import case_html, dry_run
+from .registry import get_case_types, get_case_schemas
+from .autofill import students, subjects
+from .helpers import QuerySetEncoder, SchemaBundle, get_period_choices, get_queries_by_groups
+from .helpers import encode_cursor, decode_cursor, stream_cases
 from .cases import *
 
 
@@ -63,65 +72,201 @@ def details(_):
 
 @api_view(["GET"])
 def info_cases(request):
-    if request.GET.get('cls') == '' or request.GET.get('cls') is None:
-        return JsonResponse(Request.get_cases(), status=HTTP_200_OK)
+    # The list of cases without cls, the schema of a case with it and every
+    # schema with bundle=true, all computed at startup
+    if request.GET.get('bundle') == 'true':
+        key = SchemaBundle.BUNDLE
     else:
-        for type_case in Request.get_subclasses():
-            if type_case.__name__ == request.GET.get('cls'):
-                return JsonResponse(get_fields(type_case))
+        key = request.GET.get('cls') or SchemaBundle.CASE_LIST
+    try:
+        body, etag = get_case_schemas().get(key)
+    except KeyError:
         return JsonResponse({'response': 'Not found'}, status=HTTP_404_NOT_FOUND)
+    if_none_match = parse_etags(request.META.get('HTTP_IF_NONE_MATCH', ''))
+    if etag in if_none_match or '*' in if_none_match:
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(body, content_type='application/json')
+    response['ETag'] = etag
+    # Cached by clients, but revalidated since defaults change with the date
+    response['Cache-Control'] = 'no-cache'
+    return response
 
 
 @api_view(["GET", "PATCH", "POST"])
 def case(request):
     if request.method == 'GET':
-        responses = Request.get_cases_by_query(querydict_to_dict(request.GET))
-        return JsonResponse(responses, safe=False, encoder=QuerySetEncoder)
+        query = querydict_to_dict(request.GET)
+        fields = query.pop('fields', None)
+        limit = query.pop('limit', None)
+        cursor = query.pop('cursor', None)
+        count = query.pop('count', 'false') == 'true'
+        stream = query.pop('stream', None)
+        responses = Request.get_cases_by_query(query)
+        if fields is not None:
+            # Only the requested fields are read from Mongo and returned, as
+            # fields=a,b or fields=a&fields=b
+            if isinstance(fields, str):
+                fields = fields.split(',')
+            fields = [field for field in fields if field]
+            responses = responses.only(*fields)
+        # Cases are read as raw documents and encoded from them, mongoengine
+        # documents are only built to write
+        responses = responses.as_pymongo()
+        if limit is None and cursor is None:
+            if stream in ('json', 'ndjson'):
+                # Written as the cursor is read, nothing holds the whole listing
+                ndjson = stream == 'ndjson'
+                return StreamingHttpResponse(
+                    stream_cases(responses.no_cache(), fields, ndjson),
+                    content_type='application/x-ndjson' if ndjson else 'application/json')
+            return JsonResponse(responses, safe=False, encoder=QuerySetEncoder,
+                                json_dumps_params={'fields': fields})
+        if isinstance(limit, list) or isinstance(cursor, list):
+            return JsonResponse({'error': 'limit and cursor must be given once'},
+                                status=HTTP_400_BAD_REQUEST)
+        try:
+            limit = int(limit or settings.CASES_PAGE_SIZE)
+            after = decode_cursor(cursor) if cursor else None
+        except ValueError:
+            return JsonResponse({'error': 'Invalid limit or cursor'}, status=HTTP_400_BAD_REQUEST)
+        if not 0 < limit <= settings.CASES_PAGE_SIZE:
+            return JsonResponse({'error': 'limit must be between 1 and {}'.format(
+                settings.CASES_PAGE_SIZE)}, status=HTTP_400_BAD_REQUEST)
+        return JsonResponse(cases_page(responses, limit, after, count, fields),
+                            encoder=QuerySetEncoder)
     if request.method == 'POST':
         body = json.loads(request.body)
-        subs = [c.__name__ for c in Request.get_subclasses()]
-        errors = []
-        inserted_items = []
-        for item_request in body['items']:
+        case_types = get_case_types()
+        # Every item is validated first and the valid ones are written in a
+        # single round trip, errors are reported by item index
+        failed = {}
+        valid = []
+        for index, item_request in enumerate(body['items']):
             item_request['user'] = str(request.user)
-            case = Request.get_subclasses()[subs.index(item_request['_cls'])]
-            item_request['_cls'] = case.get_entire_name()
-            new_request = case().from_json(case.translate(json.dumps(item_request)))
             try:
-                inserted_items += [str(new_request.save().id)]
+                case_type = case_types.get(item_request.get('_cls'))
+            except (KeyError, TypeError):
+                # A list or object _cls is not hashable
+                failed[index] = 'Unknown case {}'.format(item_request.get('_cls'))
+                continue
+            case = case_type.cls
+            item_request['_cls'] = case_type.entire_name
+            new_request = case.from_dict(case.translate(item_request))
+            try:
+                new_request.validate()
             except ValidationError as e:
-                errors += [e.message]
-        return JsonResponse({'inserted_items': inserted_items, 'errors': errors},
+                failed[index] = e.message
+            else:
+                valid += [(index, new_request)]
+        rejected = Request.insert_cases([new_request for _, new_request in valid])
+        inserted_items = []
+        for position, (index, new_request) in enumerate(valid):
+            if position in rejected:
+                failed[index] = rejected[position]
+            else:
+                inserted_items += [str(new_request.id)]
+        failed_items = [{'index': index, 'error': failed[index]} for index in sorted(failed)]
+        return JsonResponse({'inserted_items': inserted_items,
+                             'errors': [item['error'] for item in failed_items],
+                             'failed_items': failed_items},
                             status=HTTP_200_OK, safe=False)
     if request.method == 'PATCH':
         body = json.loads(request.body)
-        subs = [c.__name__ for c in Request.get_subclasses()]
+        case_types = get_case_types()
         errors = []
-        edited_items = []
         not_found = []
+        # All the cases are read with one query and only what changed is
+        # written back, with a single bulk_write
+        ids = [item_request.get('id') for item_request in body['items']]
+        stored_cases = {str(stored['_id']): stored for stored in Request.objects(
+            id__in=[ObjectId(_id) for _id in ids if ObjectId.is_valid(_id)]).as_pymongo()}
+        updates = {}
         for item_request in body['items']:
-            try:
-                req = Request.get_case_by_id(item_request['id'])
-            except (ValueError, KeyError):
-                not_found += [item_request['id']]
+            stored = stored_cases.get(str(item_request.get('id')))
+            if stored is None:
+                not_found += [item_request.get('id')]
                 continue
             item_request['user'] = request.user.username
-            case = req.__class__
-            item_request['_cls'] = case.get_entire_name()
-            new_request = case().from_json(case.translate(
-                json.dumps(item_request)), True)
+            case_type = case_types.by_entire_name[stored['_cls']]
+            case = case_type.cls
+            item_request['_cls'] = case_type.entire_name
+            new_request = case.from_dict(case.translate(item_request), True)
             try:
-                new_request.save()
+                new_request.validate()
             except ValidationError as e:
                 errors += [e.message]
             else:
-                edited_items += [new_request]
+                # The last edit of a case replaces the ones before
+                updates[str(stored['_id'])] = (stored, new_request)
+        rejected = Request.update_cases(list(updates.values()))
+        edited_items = [new_request for _, new_request in updates.values()]
+        if rejected:
+            failed_ids = [_id for position, _id in enumerate(updates) if position in rejected]
+            errors += [rejected[position] for position in sorted(rejected)]
+            edited_items = [item for item in edited_items if str(item.id) not in failed_ids]
         return JsonResponse({'edited_items': edited_items,
                              'errors': errors, 'not_found': not_found},
                             status=HTTP_400_BAD_REQUEST if edited_items == [] else HTTP_200_OK,
                             encoder=QuerySetEncoder, safe=False)
 
 
+def cases_page(cases, limit, after, count, fields):
+    """
+    A page of cases ordered by _id, starting after the given id. Seeking on
+    the index keeps the cost of a page the same however deep it is; the next
+    cursor is None on the last page.
+    """
+    page = cases.filter(id__gt=after) if after is not None else cases
+    page = list(page.order_by('id').limit(limit + 1))
+    data = {
+        'cases': [QuerySetEncoder.encode_son(case, fields) for case in page[:limit]],
+        'next': encode_cursor(page[limit - 1]['_id']) if len(page) > limit else None,
+    }
+    if count:
+        data['count'] = cases.count()
+    return data
+
+
+@api_view(["GET"])
+def case_search(request):
+    # Ranked full text search, the rest of the query filters as in GET /case
+    query = querydict_to_dict(request.GET)
+    text = query.pop('q', '')
+    fields = query.pop('fields', None)
+    count = query.pop('count', 'false') == 'true'
+    if not isinstance(text, str) or not text.strip():
+        return JsonResponse({'error': '"q" must be given once'}, status=HTTP_400_BAD_REQUEST)
+    try:
+        limit = int(query.pop('limit', 20))
+        page = int(query.pop('page', 1))
+    except (TypeError, ValueError):
+        # Also a repeated limit or page, read as a list
+        return JsonResponse({'error': 'Invalid limit or page'}, status=HTTP_400_BAD_REQUEST)
+    if not 0 < limit <= settings.CASES_PAGE_SIZE or page < 1:
+        return JsonResponse({'error': 'limit must be between 1 and {}, page from 1'.format(
+            settings.CASES_PAGE_SIZE)}, status=HTTP_400_BAD_REQUEST)
+    responses = Request.search_cases(text, query)
+    if fields is not None:
+        if isinstance(fields, str):
+            fields = fields.split(',')
+        fields = [field for field in fields if field]
+        responses = responses.only(*fields)
+    responses = responses.as_pymongo()
+    # Scores are not unique, so pages go by offset; Mongo keeps only the top
+    # page * limit matches while sorting
+    found = list(responses.skip((page - 1) * limit).limit(limit + 1))
+    cases = []
+    for son in found[:limit]:
+        case = QuerySetEncoder.encode_son(son, fields)
+        case['score'] = son['_text_score']
+        cases.append(case)
+    data = {'cases': cases, 'next': page + 1 if len(found) > limit else None}
+    if count:
+        data['count'] = responses.count()
+    return JsonResponse(data, encoder=QuerySetEncoder)
+
+
 def querydict_to_dict(query_dict):
     data = {}
     for key in query_dict.keys():
@@ -140,12 +285,100 @@ def get_docx_genquerie(request):
         del query_dict['pre']
     except KeyError:
         return JsonResponse({'error': "'pre' Key not provided"}, status=HTTP_400_BAD_REQUEST)
+    if query_dict.pop('dry_run', 'false') == 'true':
+        # Renders nothing, only reports the cases that would fail
+        cases = Request.get_cases_by_query(query_dict).only(
+            *Request.get_render_fields()).order_by('academic_program', '_cls')
+        return JsonResponse(dry_run(cases, precm), status=HTTP_200_OK)
+    download = query_dict.pop('download', 'false') == 'true'
+
+    # Outputs are named after their content, an unchanged query is served
+    # from the file generated before, and by the job that asked for it
+    filename = output_filename(query_dict, precm)
+    job = GenerationJob.find_latest(str(request.user), filename)
+    try:
+        # Served files are kept, see writter.remove_old_outputs. The worker
+        # may remove one at any moment, a missing file is generated again
+        os.utime(filename)
+        document = open(filename, 'rb') if download else None
+    except FileNotFoundError:
+        pass
+    else:
+        if document is not None:
+            return FileResponse(document, as_attachment=True,
+                                filename='acta.docx', content_type=DOCX_CONTENT_TYPE)
+        if job is None or job.status != GenerationJob.ST_DONE:
+            job = GenerationJob.enqueue(str(request.user), query_dict, precm, filename, done=True)
+        return JsonResponse(job.as_dict(), status=HTTP_200_OK)
+    if download and Request.get_cases_by_query(
+            query_dict).count() <= settings.DOWNLOAD_MAX_CASES:
+        # Small minutes are rendered within the request and streamed back
+        # without touching disk, bigger ones go through the queue below
+        generator = UnifiedWritter()
+        generator.generate_document_by_querie(query_dict, precm, save=False)
+        return docx_response(generator, 'acta.docx')
+    if job is None or job.is_finished():
+        job = GenerationJob.enqueue(str(request.user), query_dict, precm, filename)
+    return JsonResponse(job.as_dict(), status=HTTP_202_ACCEPTED)
+
+
+def docx_response(generator, filename):
+    buffer, size = generator.stream()
+    response = FileResponse(buffer, as_attachment=True, filename=filename,
+                            content_type=DOCX_CONTENT_TYPE)
+    response['Content-Length'] = size
+    return response
+
+
+@api_view(["GET"])
+def preview_case(request, case_id):
+    pre = request.GET.get('pre', 'false') == 'true'
+    # 'format' is taken by DRF's content negotiation
+    as_html = request.GET.get('html', 'false') == 'true'
+    try:
+        if as_html:
+            case = Request.get_case_by_id(case_id)
+        else:
+            document = case_preview(case_id, pre)
+    except (ValueError, KeyError):
+        return JsonResponse({'error': 'case not found'}, status=HTTP_404_NOT_FOUND)
+    if as_html:
+        return HttpResponse(case_html(case, pre))
+    return FileResponse(io.BytesIO(document), as_attachment=True,
+                        filename='{}{}.docx'.format('pcm' if pre else 'cm', case_id),
+                        content_type=DOCX_CONTENT_TYPE)
+
+
+def get_own_job(request, job_id):
+    try:
+        job = GenerationJob.get_job_by_id(job_id)
+    except (ValueError, KeyError):
+        return None
+    return job if job.user == str(request.user) else None
+
+
+@api_view(["GET"])
+def generation_status(request, job_id):
+    job = get_own_job(request, job_id)
+    if job is None:
+        return JsonResponse({'error': 'job not found'}, status=HTTP_404_NOT_FOUND)
+    return JsonResponse(job.as_dict(), status=HTTP_200_OK)
 
-    generator = UnifiedWritter()
-    generator.filename = 'public/' + \
-        str(request.user) + str(datetime.date.today()) + '.docx'
-    generator.generate_document_by_querie(query_dict, precm)
-    return JsonResponse({'url': generator.filename}, status=HTTP_200_OK)
+
+@api_view(["GET"])
+def generation_download(request, job_id):
+    job = get_own_job(request, job_id)
+    if job is None:
+        return JsonResponse({'error': 'job not found'}, status=HTTP_404_NOT_FOUND)
+    if job.status != GenerationJob.ST_DONE:
+        return JsonResponse(job.as_dict(), status=HTTP_409_CONFLICT)
+    try:
+        document = open(job.filename, 'rb')
+    except FileNotFoundError:
+        return JsonResponse({'error': 'file not found'}, status=HTTP_410_GONE)
+    return FileResponse(document, as_attachment=True,
+                        filename=os.path.basename(job.filename),
+                        content_type=DOCX_CONTENT_TYPE)
 
 @api_view(["POST"])
 def autofill(request):
@@ -179,37 +412,41 @@ def autofill(request):
         return JsonResponse({'error':'field "field" no encontrado'}, safe=False, status=HTTP_400_BAD_REQUEST)
 
 
-@api_view(["GET"])
-@permission_classes((AllowAny,))
-def programs_defined(_):
-    programs = sorted([plan[1] for plan in Request.PLAN_CHOICES])
-    return JsonResponse({'programs': programs})
-
-
-def querydict_to_dict(query_dict):
-    data = {}
-    for key in query_dict.keys():
-        v = query_dict.getlist(key)
-        if len(v) == 1:
-            v = v[0]
-        data[key] = v
-    return data
+@api_view(["POST"])
+def autofill_batch(request):
+    # Resolves pasted lists of DNIs and subject codes with one query each
+    body = json.loads(request.body)
+    response = {'missing': {}}
+    for key, index, name in (('student_dni', students, 'students'),
+                             ('subject_code', subjects, 'subjects')):
+        values = body.get(key, [])
+        if not isinstance(values, list):
+            return JsonResponse({'error': '"{}" must be a list'.format(key)},
+                                status=HTTP_400_BAD_REQUEST)
+        response[name], response['missing'][key] = index.resolve(values)
+    return JsonResponse(response, status=HTTP_200_OK)
 
 
 @api_view(["GET"])
-def get_docx_genquerie(request):
-    query_dict = querydict_to_dict(request.GET)
+def autofill_search(request):
+    # Type-ahead over DNI and name of students, or code and name of subjects
+    index = {'name': students, 'subject': subjects}.get(request.GET.get('field'))
+    if index is None:
+        return JsonResponse({'error': '"field" must be name or subject'},
+                            status=HTTP_400_BAD_REQUEST)
     try:
-        precm = query_dict['pre'] == 'true'
-        del query_dict['pre']
-    except KeyError:
-        return JsonResponse({'error': "'pre' Key not provided"}, status=HTTP_400_BAD_REQUEST)
+        limit = min(max(int(request.GET.get('limit', 10)), 1), 50)
+    except ValueError:
+        return JsonResponse({'error': 'Invalid limit'}, status=HTTP_400_BAD_REQUEST)
+    return JsonResponse({'results': index.search(request.GET.get('q', ''), limit)},
+                        status=HTTP_200_OK)
 
-    generator = UnifiedWritter()
-    generator.filename = 'public/' + \
-        str(request.user) + str(datetime.date.today()) + '.docx'
-    generator.generate_document_by_querie(query_dict, precm)
-    return JsonResponse({'url': generator.filename}, status=HTTP_200_OK)
+
+@api_view(["GET"])
+@permission_classes((AllowAny,))
+def programs_defined(_):
+    programs = sorted([plan[1] for plan in Request.PLAN_CHOICES])
+    return JsonResponse({'programs': programs})
 
 @api_view(["GET"])
 @permission_classes((AllowAny,))
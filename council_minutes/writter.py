@@ -1,60 +1,278 @@
 
+import io
+import os
+import glob
+import json
+import time
+import hashlib
+import tempfile
+import functools
+import multiprocessing
+from collections import deque
+from itertools import repeat, islice
+from concurrent.futures import ProcessPoolExecutor
 import dateparser
+import django
+from django.conf import settings
 from docx import Document, enum
-from docx.shared import RGBColor, Pt
+from docx.opc.constants import RELATIONSHIP_TYPE
+from docx.oxml import parse_xml
+from docx.oxml.ns import qn
+from docx.shared import RGBColor, Pt, Length
+from lxml import etree
 from .models import Request
-from .cases.case_utils import header
+from .helpers import LRUCache
+from .renderers import write_case
+
+
+def init_render_process():
+    # Render processes are spawned, not forked, so each one sets up Django,
+    # which registers the case classes once the app is ready.
+    django.setup()
+
+
+@functools.lru_cache(maxsize=None)
+def styled_template():
+    """
+    Builds the base document of every generation once per process, with all
+    the styles in 'Ancizar Sans' and black plus the 'List Hyperlink' style,
+    and returns it saved as bytes so each generation only has to load it.
+    """
+    document = Document()
+    for style in document.styles:
+        try:
+            document.styles[style.name].font.name = 'Ancizar Sans'
+            document.styles[style.name].font.color.rgb = RGBColor(
+                0x00, 0x00, 0x00)
+        except:  # pylint: disable=bare-except
+            pass
+    hyperlink_style = document.styles.add_style(
+        'List Hyperlink', enum.style.WD_STYLE_TYPE.PARAGRAPH)
+    hyperlink_style.base_style = document.styles['List Bullet']
+    hyperlink_style.font.color.rgb = RGBColor(0x00, 0x00, 0xFF)
+    hyperlink_style.font.underline = True
+    stream = io.BytesIO()
+    document.save(stream)
+    return stream.getvalue()
+
+
+DOCX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+
+
+# Bump whenever a change in the case classes alters what they render, so
+# fragments rendered by the old code are not reused.
+RENDERER_VERSION = 1
+
+
+def fragment_size(fragment):
+    return sum(len(element) for element in fragment[0])
+
+
+fragment_cache = LRUCache(settings.FRAGMENT_CACHE_SIZE, fragment_size)
+
+
+def fragment_key(case_id, case_json, pcm):
+    content_hash = hashlib.sha1(case_json.encode('utf-8')).hexdigest()
+    return (str(case_id), content_hash, 'pcm' if pcm else 'cm', RENDERER_VERSION)
+
+
+preview_cache = LRUCache(settings.PREVIEW_CACHE_SIZE)
+
+
+def case_preview(caseid, pre):
+    """
+    Returns the .docx of a single case as bytes. Previews are cached by the
+    content of the case, so an unchanged case is served without rendering.
+    """
+    case = Request.get_case_by_id(caseid)
+    key = fragment_key(case.id, case.to_json(), pre)
+    document = preview_cache.get(key) if case.self_contained else None
+    if document is None:
+        writter = UnifiedWritter()
+        rendered = writter.generate_case_example(case, pre, save=False)
+        buffer, _ = writter.stream()
+        with buffer:
+            document = buffer.read()
+        # Errors are rendered again, they may come from something else
+        if rendered and case.self_contained:
+            preview_cache.put(key, document)
+    return document
+
+
+def output_filename(query, precm, directory='public/'):
+    """
+    Names the output of a generation after what it contains: the normalized
+    query, the pre flag, the renderer version and the version of the matched
+    cases, so generating an unchanged query again maps to the same file.
+    The cases themselves are never read.
+    """
+    # Repeated values, as in academic_program__in, in any order
+    normalized = {key: sorted(value, key=str) if isinstance(value, list) else value
+                  for key, value in query.items()}
+    digest = hashlib.sha1(json.dumps(
+        [normalized, precm, RENDERER_VERSION, Request.get_cases_version(query)],
+        sort_keys=True, default=str).encode('utf-8'))
+    return '{}{}.docx'.format(directory, digest.hexdigest())
+
+
+def remove_old_outputs(seconds, directory='public/'):
+    """
+    Deletes the generated documents not written or served for longer than
+    seconds, including temporaries left by an interrupted save. Returns how
+    many were deleted.
+    """
+    removed = 0
+    limit = time.time() - seconds
+    for filename in glob.glob(os.path.join(directory, '*.docx')):
+        try:
+            if os.path.getmtime(filename) < limit:
+                os.remove(filename)
+                removed += 1
+        except FileNotFoundError:
+            pass
+    return removed
+
+
+def batches(iterable, size):
+    # A generator, because iter() on a no_cache queryset starts it over
+    iterator = (item for item in iterable)
+    batch = list(islice(iterator, size))
+    while batch:
+        yield batch
+        batch = list(islice(iterator, size))
+
+
+def render_case_fragment(case_json, pcm):
+    """
+    Renders a single case into a blank document and returns it as a fragment,
+    with whether it rendered without errors. Runs inside the render pool, so
+    it gets the case as JSON.
+    """
+    writter = UnifiedWritter()
+    rendered = writter.write_case(Request.from_json(case_json), pcm)
+    return writter.export_fragment(), rendered
 
 
 class UnifiedWritter():
 
-    def __init__(self):
-        self.document = Document()
+    def __init__(self, processes=1):
+        self.document = Document(io.BytesIO(styled_template()))
         self.filename = 'public/'
-        for style in self.document.styles:
-            try:
-                self.document.styles[style.name].font.name = 'Ancizar Sans'
-                self.document.styles[style.name].font.color.rgb = RGBColor(
-                    0x00, 0x00, 0x00)
-            except:  # pylint: disable=bare-except
-                pass
-        hyperlink_style = self.document.styles.add_style(
-            'List Hyperlink', enum.style.WD_STYLE_TYPE.PARAGRAPH)
-        hyperlink_style.base_style = self.document.styles['List Bullet']
-        hyperlink_style.font.color.rgb = RGBColor(0x00, 0x00, 0xFF)
-        hyperlink_style.font.underline = True
         self.case_count = 0
+        self.case_total = 0
+        # Optional callable(done, total), used by the generation worker
+        self.progress = None
+        # With more than one process every case is rendered as a fragment in a
+        # process pool and spliced back in order
+        self.processes = processes
+        # Fragments are also used, and cached, on a single process unless the
+        # fragment cache is disabled
+        self.use_fragments = processes > 1 or fragment_cache.max_size > 0
 
-    def generate_case_example_by_id(self, caseid, pre):
+    def generate_case_example_by_id(self, caseid, pre, save=True):
         case = Request.get_case_by_id(caseid)
-        print(case)
         if case is None:
             raise KeyError
-        if pre:
-            self.filename += 'pcm' + caseid + '.docx'
-            self.__write_case_pcm(case)
+        self.generate_case_example(case, pre, save)
+
+    def generate_case_example(self, case, pre, save=True):
+        self.filename += ('pcm' if pre else 'cm') + str(case.id) + '.docx'
+        # Errors in the case are rendered into the document, as in the minutes
+        rendered = self.write_case(case, pre)
+        if save:
+            self.__generate()
+        return rendered
+
+    def generate_document_by_querie(self, query, precm, save=True):
+        cases = Request.get_cases_by_query(query).only(*Request.get_render_fields())
+        # The split is done by Mongo and the cases are streamed in batches,
+        # only a few batches are in memory at any time
+        casespre = cases.filter(academic_program__in=Request.PRE_PROGRAMS)
+        casespos = cases.filter(academic_program__nin=Request.PRE_PROGRAMS)
+        self.case_total = casespre.count() + casespos.count()
+        casespre, casespos = [
+            subset.order_by('academic_program', '_cls').no_cache().batch_size(
+                settings.GENERATION_BATCH_SIZE)
+            for subset in (casespre, casespos)]
+        if self.processes > 1:
+            context = multiprocessing.get_context('spawn')
+            with ProcessPoolExecutor(max_workers=self.processes, mp_context=context,
+                                     initializer=init_render_process) as pool:
+                self.__write_case_collection(casespre, True, precm, pool)
+                self.__write_case_collection(casespos, False, precm, pool)
         else:
-            self.filename += 'cm' + caseid + '.docx'
-            self.__write_case_cm(case)
-        self.__generate()
-        
-    def generate_document_by_querie(self, query, precm):
-        cases = Request.get_cases_by_query(query).order_by(
-            'academic_program', '_cls')
-        casespre = [
-            case for case in cases if case.is_pre()]
-        casespos = [
-            case for case in cases if not case.is_pre()]
-        self.__write_case_collection(casespre, True, precm)
-        self.__write_case_collection(casespos, False, precm)
-        self.__generate()
-
-    def __write_case_cm(self, case):
-        case.cm(self.document)
-
-    def __write_case_pcm(self, case):
-        header(case, self.document)
-        case.pcm(self.document)
+            self.__write_case_collection(casespre, True, precm)
+            self.__write_case_collection(casespos, False, precm)
+        if save:
+            self.__generate()
+
+    def stream(self):
+        """
+        Saves the document into a buffer that stays in memory up to
+        settings.DOCX_SPOOL_SIZE bytes and spills to a temporary file past
+        that, and returns it rewound along with its size.
+        """
+        buffer = tempfile.SpooledTemporaryFile(max_size=settings.DOCX_SPOOL_SIZE)
+        self.document.save(buffer)
+        size = buffer.tell()
+        buffer.seek(0)
+        return buffer, size
+
+    def write_case(self, request, pcm):
+        return write_case(self.document, request, pcm)
+
+    def export_fragment(self, start=0):
+        """
+        Serializes the body elements from the start index on as a fragment:
+        the elements, the hyperlink targets they reference by relationship id
+        and the 'Table Grid' font size if the case set it.
+        """
+        body = self.document.element.body
+        elements = [element for element in body[start:] if element.tag != qn('w:sectPr')]
+        links = {}
+        for element in elements:
+            for hyperlink in element.iter(qn('w:hyperlink')):
+                r_id = hyperlink.get(qn('r:id'))
+                links[r_id] = self.document.part.rels[r_id].target_ref
+        # Length subclasses do not survive pickling, send the size in EMU
+        table_font_size = self.document.styles['Table Grid'].font.size
+        return ([etree.tostring(element) for element in elements], links,
+                None if table_font_size is None else int(table_font_size))
+
+    def capture_case(self, request, pcm):
+        """
+        Writes the case in place and returns what it wrote as a fragment, the
+        same one rendering it on a blank document would give, or None if the
+        case failed and wrote its error.
+        """
+        body = self.document.element.body
+        start = len(body) - (0 if body.sectPr is None else 1)
+        table_style = self.document.styles['Table Grid']
+        table_font_size = table_style.font.size
+        table_style.font.size = None
+        rendered = self.write_case(request, pcm)
+        fragment = self.export_fragment(start)
+        if table_style.font.size is None:
+            table_style.font.size = table_font_size
+        return fragment if rendered else None
+
+    def splice_fragment(self, fragment):
+        elements, links, table_font_size = fragment
+        body = self.document.element.body
+        for xml in elements:
+            element = parse_xml(xml)
+            for hyperlink in element.iter(qn('w:hyperlink')):
+                r_id = hyperlink.get(qn('r:id'))
+                if r_id in links:
+                    hyperlink.set(qn('r:id'), self.document.part.relate_to(
+                        links[r_id], RELATIONSHIP_TYPE.HYPERLINK, is_external=True))
+            if body.sectPr is not None:
+                body.sectPr.addprevious(element)
+            else:
+                body.append(element)
+        # Case tables restyle 'Table Grid' document wide, last one wins
+        if table_font_size is not None:
+            self.document.styles['Table Grid'].font.size = Length(table_font_size)
 
     def __write_document_header(self, precm):
         run = self.document.add_paragraph(style='Heading 1').add_run(
@@ -76,13 +294,57 @@ class UnifiedWritter():
         run.font.bold = True
         run.font.size = Pt(12)
 
-    def __write_case_collection(self, cases, pre, pcm):
+    def __fragments(self, cases, pcm, pool):
+        """
+        Yields every case with its cache key and fragment, in order. Cases are
+        taken in batches and, with a pool, the next batch is already being
+        rendered while the current one is written. Unchanged cases come from
+        the fragment cache, the rest are rendered in the pool or, without
+        one, yielded with a None fragment to be captured in place. Cases that
+        are not self contained get a None key and are written in place.
+        """
+        pending = deque()
+        for batch in batches(cases, settings.GENERATION_BATCH_SIZE):
+            pending.append(self.__submit_batch(batch, pcm, pool))
+            if len(pending) > 1:
+                yield from pending.popleft()
+        while pending:
+            yield from pending.popleft()
+
+    def __submit_batch(self, batch, pcm, pool):
+        documents = [case.to_json() for case in batch]
+        keys = [fragment_key(case.id, document, pcm) if case.self_contained else None
+                for case, document in zip(batch, documents)]
+        cached = [fragment_cache.get(key) if key is not None else None for key in keys]
+        rendered = repeat((None, False))
+        if pool is not None:
+            missing = [documents[i] for i, fragment in enumerate(cached)
+                       if fragment is None and keys[i] is not None]
+            chunksize = max(1, len(missing) // (4 * self.processes))
+            rendered = pool.map(render_case_fragment, missing, repeat(pcm),
+                                chunksize=chunksize)
+        return self.__collect_batch(batch, keys, cached, rendered)
+
+    @staticmethod
+    def __collect_batch(batch, keys, cached, rendered):
+        for case, key, fragment in zip(batch, keys, cached):
+            if fragment is None and key is not None:
+                fragment, cacheable = next(rendered)
+                if cacheable:
+                    fragment_cache.put(key, fragment)
+            yield case, key, fragment
+
+    def __write_case_collection(self, cases, pre, pcm, pool=None):
+        if self.use_fragments:
+            cases = self.__fragments(cases, pcm, pool)
+        else:
+            cases = ((case, None, None) for case in cases)
         list_level_1 = 9 if pre else 10
         list_level_2 = 0
         list_level_3 = 0
         actual_case = 'dummy'
         actual_academic_program = 'dummy'
-        for request in cases:
+        for request, key, fragment in cases:
             if actual_academic_program != request.academic_program:
                 list_level_2 = list_level_2 + 1
                 actual_academic_program = request.academic_program
@@ -102,22 +364,28 @@ class UnifiedWritter():
                 request.student_dni))
             run.font.bold = True
             run.font.size = Pt(12)
-            try:
-                if pcm:
-                    self.__write_case_pcm(request)
-                else:
-                    self.__write_case_cm(request)
-            except NotImplementedError:
-                self.document.add_paragraph()
-                self.document.add_paragraph(
-                    'Not Implemented case {}'.format(request.full_name))
-                self.document.add_paragraph()
-            except Exception as err:  # pylint: disable=broad-except
-                self.document.add_paragraph()
-                self.document.add_paragraph(
-                    'Error en el acta {}'.format(request.id))
-                self.document.add_paragraph('Trace: {}'.format(err))
-                self.document.add_paragraph()
+            if key is None:
+                self.write_case(request, pcm)
+            elif fragment is None:
+                fragment = self.capture_case(request, pcm)
+                if fragment is not None:
+                    fragment_cache.put(key, fragment)
+            else:
+                self.splice_fragment(fragment)
+            self.case_count = self.case_count + 1
+            if self.progress is not None:
+                self.progress(self.case_count, self.case_total)
 
     def __generate(self):
-        self.document.save(self.filename)
+        # Saved beside the target and renamed over it, so concurrent
+        # generations of the same file never expose a partial document
+        descriptor, temporary = tempfile.mkstemp(
+            suffix='.docx', dir=os.path.dirname(self.filename) or '.')
+        os.close(descriptor)
+        try:
+            self.document.save(temporary)
+            os.chmod(temporary, 0o644)
+            os.replace(temporary, self.filename)
+        except BaseException:
+            os.remove(temporary)
+            raise